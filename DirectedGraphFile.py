@@ -1,8 +1,6 @@
-import cv2
 import numpy as np
-import random
 from TypesAndConstants import *
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, Iterable
 import logging
 
 
@@ -12,12 +10,13 @@ class DirectedGraph:
     EDGE_OFFSET = 4
     ARROW_SIZE = 5
     TEXT_OFFSET = 10
+    DIRECTED = True  # (UndirectedGraph overrides this.) Each graph copies it into i_am_directed.
 
     def __init__(self, V: Dict[int, Vertex] = None,
                  E: Dict[int, Edge] = None,
                  filename: str = None,
                  keys: Tuple[str] = ()) -> None:
-        self.i_am_directed = True
+        self.i_am_directed = self.DIRECTED
         self.V = V
         if V is None:
             self.V: Dict[int, Vertex] = {}
@@ -35,6 +34,46 @@ class DirectedGraph:
         self.v_edge_table: Dict[int, List[int]] = {}
         self.generate_edge_tables()
 
+    def subgraph_view(self,
+                      edge_ids: Iterable[int] = (),
+                      keys: Tuple[str] = (),
+                      view_class: type = None) -> "DirectedGraph":
+        """
+        makes a lightweight graph of the same type as this one that shares this graph's vertex dictionary and holds
+        only the edges with the given ids. Unlike the constructor, this does not scan all of E or build the edge
+        tables up front, so it runs in O(k) for k selected edges; the edge tables are built lazily, the first time a
+        neighbor query is made. You can still add_edge() to the view, and draw_self() it, as with any other graph.
+        Note: the vertices and the selected edge records are shared, not copied - changing them changes this graph.
+        :param edge_ids: the ids (in this graph) of the edges to include in the view. They keep their ids.
+        :param keys: the additional keys that should be drawn for the edges in the view.
+        :param view_class: the class of the view, if not the same as this graph's - e.g., DirectedGraph, for a flow
+                           or residual graph that must stay directed even when this graph is undirected.
+        :return: the new view.
+        """
+        if view_class is None:
+            view_class = self.__class__
+        view: DirectedGraph = view_class.__new__(view_class)
+        view.init_as_view_of(self, edge_ids, keys)
+        return view
+
+    def init_as_view_of(self, parent: "DirectedGraph", edge_ids: Iterable[int], keys: Tuple[str]) -> None:
+        """
+        fills in the fields of a graph made by subgraph_view(), in place of __init__.
+        :param parent: the graph whose vertices (and edges) this view shares
+        :param edge_ids: the ids of the parent's edges to include
+        :param keys: the additional keys of the view
+        :return: None
+        """
+        self.i_am_directed = self.DIRECTED  # (which may not be the parent's - see subgraph_view().)
+        self.V = parent.V
+        self.E = {e_id: parent.E[e_id] for e_id in edge_ids}
+        self.additional_keys = list(keys)
+        self.max_edge_id = max(self.E, default=0)
+
+        self.edge_tables_dirty = True
+        self.u_edge_table = {}
+        self.v_edge_table = {}
+
     def update_max_edge_id(self) -> None:
         """
         a quick function to figure out what the largest "E" node id was, so that we can be sure to give a unique id to
@@ -64,10 +103,10 @@ class DirectedGraph:
                     num_V: int = int(items[0])
                     num_E: int = int(items[1])
                 elif count <= num_V:
-                    self.V[int(items[0])] = {KEY_LABEL: items[1], KEY_LOCATION: (int(items[2]), int(items[3])),
-                                             KEY_COLOR: (1.0, 1.0, 1.0)}
+                    self.V[int(items[0])] = Vertex(label=items[1], location=(int(items[2]), int(items[3])),
+                                                   color=(1.0, 1.0, 1.0))
                 else:
-                    self.E[int(items[0])] = {KEY_U: int(items[1]), KEY_V: int(items[2])}
+                    self.E[int(items[0])] = Edge(u=int(items[1]), v=int(items[2]))
                     for i in range(3, len(items), 2):
                         self.E[int(items[0])][items[i]] = int(items[i+1])
                         if items[i] not in self.additional_keys:
@@ -177,7 +216,7 @@ class DirectedGraph:
         :return: the index of the edge in the dictionary E, or -1 if not found.
         """
         for edge_id in self.E.keys():
-            if self.E[edge_id] == edge:
+            if self.E[edge_id] is edge:
                 return edge_id
         return -1
 
@@ -212,7 +251,7 @@ class DirectedGraph:
         :return:
         """
         self.max_edge_id += 1
-        self.E[self.max_edge_id] = {KEY_U: u_id, KEY_V: v_id}
+        self.E[self.max_edge_id] = Edge(u=u_id, v=v_id)
         for key in additional_info:
             self.E[self.max_edge_id][key] = additional_info[key]
             if key not in self.additional_keys:  # track other keys that have been used in this program.
@@ -232,6 +271,133 @@ class DirectedGraph:
         self.E[self.max_edge_id] = edge
         self.edge_tables_dirty = True  # the edge_tables will need an update before we can use them.
 
+    def to_edge_arrays(self, keys: Tuple[str] = None) -> Dict[str, np.ndarray]:
+        """
+        exports the edges of this graph as parallel numpy columns, e.g., to hand a flow or an MST to other tools
+        without a dictionary of dictionaries. (The edges are stored as individual records, so this is a copy.)
+        :param keys: the additional keys to export as columns; None means all of this graph's additional_keys.
+        :return: {"id": edge ids, KEY_U: u vertex ids, KEY_V: v vertex ids, key: values, ...}, all arrays of length
+                 len(E), in the order of E. The ids are int64; each key's column has whatever dtype numpy picks for
+                 its values - int64 for ints, but float64 if any of them is a float, so nothing is truncated.
+        """
+        if keys is None:
+            keys = tuple(self.additional_keys)
+        edges: List[Edge] = list(self.E.values())
+        columns: Dict[str, np.ndarray] = {"id": np.fromiter(self.E.keys(), dtype=np.int64, count=len(edges))}
+        for key in (KEY_U, KEY_V):
+            columns[key] = np.fromiter((e[key] for e in edges), dtype=np.int64, count=len(edges))
+        for key in keys:
+            columns[key] = np.array([e[key] for e in edges]) if len(edges) > 0 else np.zeros(0, dtype=np.int64)
+        return columns
+
+    @classmethod
+    def from_edge_arrays(cls,
+                         u: np.ndarray,
+                         v: np.ndarray,
+                         attributes: Dict[str, np.ndarray] = None,
+                         V: Dict[int, Vertex] = None,
+                         labels: List[str] = None,
+                         edge_ids: np.ndarray = None) -> "DirectedGraph":
+        """
+        builds a graph from parallel columns of edge data (as made by to_edge_arrays(), or by another tool), without
+        going through add_edge() one edge at a time.
+        :param u: the u vertex id of each edge
+        :param v: the v vertex id of each edge
+        :param attributes: {key: values} for each additional key, e.g., {KEY_CAPACITY: capacities}. A float column
+                           that holds only whole numbers (as scipy matrices usually do) is stored as ints, since the
+                           solvers count in ints; any other column keeps its values' type.
+        :param V: the vertices of the new graph. If None, vertices 0 -> max id are made, at location (0, 0).
+        :param labels: if V is None, the label for each of those vertices (by id); if this is None too, each
+                       vertex's id is its label.
+                       For the max flow solver, you'll want one of them to be "S" and another "T".
+        :param edge_ids: the id of each edge; if None, the edges are numbered from 0.
+        :return: the new graph.
+        """
+        if attributes is None:
+            attributes = {}
+        if V is None:
+            V = cls.make_vertices(int(max(np.max(u, initial=-1), np.max(v, initial=-1))) + 1, labels)
+        graph: DirectedGraph = cls(V=V, E={}, keys=tuple(attributes))
+
+        names: Tuple[str, ...] = (KEY_U, KEY_V) + tuple(attributes)
+        columns: List[list] = ([np.asarray(u).astype(np.int64, copy=False).tolist(),
+                                np.asarray(v).astype(np.int64, copy=False).tolist()] +
+                               [cls.whole_numbers_as_ints(column).tolist() for column in attributes.values()])
+        ids = range(len(columns[0])) if edge_ids is None else np.asarray(edge_ids).tolist()
+        graph.E = {e_id: Edge(**dict(zip(names, values))) for e_id, *values in zip(ids, *columns)}
+        graph.update_max_edge_id()
+        graph.edge_tables_dirty = True  # built the first time a neighbor query is made.
+        return graph
+
+    @staticmethod
+    def whole_numbers_as_ints(column: np.ndarray) -> np.ndarray:
+        """
+        :return: the column as int64, if it is a float column of whole numbers; otherwise, the column as it is.
+        """
+        column = np.asarray(column)
+        if column.dtype.kind == "f" and np.all(np.isfinite(column)) and np.array_equal(column, np.floor(column)):
+            return column.astype(np.int64)
+        return column
+
+    @staticmethod
+    def make_vertices(num_vertices: int, labels: List[str] = None) -> Dict[int, Vertex]:
+        """
+        makes vertices with ids 0 -> num_vertices-1, all at location (0, 0), for graphs built from arrays.
+        :param num_vertices: how many vertices to make
+        :param labels: the label for each vertex, by id; if None, each vertex's id is its label.
+        :return: the new dictionary of vertices.
+        """
+        if labels is None:
+            labels = [str(v_id) for v_id in range(num_vertices)]
+        return {v_id: Vertex(label=labels[v_id], location=(0, 0), color=(1.0, 1.0, 1.0))
+                for v_id in range(num_vertices)}
+
+    def to_csr(self, key: str = KEY_CAPACITY):
+        """
+        exports this graph as a scipy.sparse adjacency matrix, with entry [u, v] holding the edge's value for "key".
+        (Parallel edges are summed. An undirected graph gives a symmetric matrix, with each self-loop counted once.)
+        Needs scipy.
+        :param key: which attribute of the edges to put in the matrix
+        :return: a (n x n) scipy.sparse.csr_matrix, where n is one more than the largest vertex id.
+        """
+        import scipy.sparse  # only needed here, so scipy is not required to use the rest of this class.
+        columns: Dict[str, np.ndarray] = self.to_edge_arrays((key,))
+        u, v, values = columns[KEY_U], columns[KEY_V], columns[key]
+        if not self.i_am_directed:
+            mirror: np.ndarray = u != v  # a self-loop is already on the diagonal; mirroring it would count it twice.
+            u, v, values = (np.concatenate([u, v[mirror]]), np.concatenate([v, u[mirror]]),
+                            np.concatenate([values, values[mirror]]))
+        size: int = max(self.V, default=-1) + 1
+        return scipy.sparse.csr_matrix((values, (u, v)), shape=(size, size))
+
+    @classmethod
+    def from_csr(cls,
+                 matrix,
+                 key: str = KEY_CAPACITY,
+                 V: Dict[int, Vertex] = None,
+                 labels: List[str] = None) -> "DirectedGraph":
+        """
+        builds a graph from a scipy.sparse adjacency matrix, with an edge u -> v for each stored entry [u, v]. For an
+        UndirectedGraph, only the upper triangle (u <= v) is read, so a symmetric matrix gives one edge per pair.
+        The matrix's index and data arrays are converted once, rather than being visited entry by entry. A float
+        matrix of whole numbers gives int values, as in from_edge_arrays().
+        :param matrix: any scipy.sparse matrix (or anything with a tocsr() method)
+        :param key: the attribute each edge's value is stored as
+        :param V: the vertices of the new graph; see from_edge_arrays().
+        :param labels: the labels of the vertices, if V is None; see from_edge_arrays().
+        :return: the new graph.
+        """
+        matrix = matrix.tocsr()
+        u: np.ndarray = np.repeat(np.arange(matrix.shape[0], dtype=np.int64), np.diff(matrix.indptr))
+        v: np.ndarray = matrix.indices.astype(np.int64, copy=False)
+        values: np.ndarray = matrix.data
+        if not cls.DIRECTED:
+            upper: np.ndarray = u <= v
+            u, v, values = u[upper], v[upper], values[upper]
+        if V is None:
+            V = cls.make_vertices(matrix.shape[0], labels)
+        return cls.from_edge_arrays(u, v, {key: values}, V=V)
+
     def draw_self(self, window: np.ndarray = None,
                   origin: Tuple[int, int] = (0, 0),
                   caption: str = None,
@@ -247,77 +413,41 @@ class DirectedGraph:
         :param cut_color: A BGR tuple [0.0-1.0) for the color of this edge if is cut.
         :return: the window in which this was drawn
         """
-        if window is None:
-            window = np.zeros([800, 800, 3], dtype=float)
-
-        # DRAW EDGES
-        for key in self.E:
-            e: Edge = self.E[key]
-            u: Vertex = self.V[e[KEY_U]]
-            v: Vertex = self.V[e[KEY_V]]
-            dx: int = u[KEY_LOCATION][0] - v[KEY_LOCATION][0]
-            dy: int = u[KEY_LOCATION][1] - v[KEY_LOCATION][1]
-            d: float = np.sqrt(dx**2 + dy**2)
-            # logging.info(f"u={u}\tv={v}\tdx={dx}\tdy={dy}\d={d}")
-            if d > 2*self.VERTEX_RADIUS:
-                i: Tuple[float, float] = (dx/d, dy/d)
-                j: Tuple[float, float] = (-i[1], i[0])
-                # logging.info(f"i={i}\tj={j}")
-                if color is None:
-                    line_color_to_draw: Tuple[float, float, float] = (random.randrange(25, 100)/100,
-                                                                      random.randrange(25, 100)/100,
-                                                                      random.randrange(25, 100)/100)
-                else:
-                    if u[KEY_COLOR] == v[KEY_COLOR]:
-                        line_color_to_draw = color
-                    else:
-                        line_color_to_draw = cut_color
-                point_u = (int(origin[0]+u[KEY_LOCATION][0]-i[0]*self.VERTEX_RADIUS+j[0]*self.EDGE_OFFSET),
-                           int(origin[1]+u[KEY_LOCATION][1]-i[1]*self.VERTEX_RADIUS+j[1]*self.EDGE_OFFSET))
-
-                point_v = (int(origin[0]+v[KEY_LOCATION][0] + i[0] * self.VERTEX_RADIUS + j[0] * self.EDGE_OFFSET),
-                           int(origin[1]+v[KEY_LOCATION][1] + i[1] * self.VERTEX_RADIUS + j[1] * self.EDGE_OFFSET))
-                cv2.line(window, point_u, point_v, line_color_to_draw, 1)
-
-                # draw arrowheads
-                if self.i_am_directed:
-                    a1 = (int(point_v[0] + i[0] * self.ARROW_SIZE + j[0] * self.ARROW_SIZE),
-                          int(point_v[1] + i[1] * self.ARROW_SIZE + j[1] * self.ARROW_SIZE))
-                    a2 = (int(point_v[0] + i[0] * self.ARROW_SIZE - j[0] * self.ARROW_SIZE),
-                          int(point_v[1] + i[1] * self.ARROW_SIZE - j[1] * self.ARROW_SIZE))
-                    cv2.line(window, point_v, a1, line_color_to_draw, 1)
-                    cv2.line(window, point_v, a2, line_color_to_draw, 1)
-                    cv2.line(window, a1, a2, line_color_to_draw, 1)
-
-                # draw edge labels
-                angle = np.arctan2(dy, -dx) * 180 / np.pi
-                tx = int(origin[0] + (v[KEY_LOCATION][0] + u[KEY_LOCATION][0]) / 2 + j[0] * self.TEXT_OFFSET)
-                ty = int(origin[1] + (v[KEY_LOCATION][1] + u[KEY_LOCATION][1]) / 2 + j[1] * self.TEXT_OFFSET)
-
-                if len(self.additional_keys) > 0:
-                    text_to_draw = ""
-                    for additional_key in self.additional_keys:
-                        # print(key)
-                        text_to_draw = f"{text_to_draw} {e[additional_key]},"
-                    text_to_draw = text_to_draw[:-1]
-
-                    self.draw_rotated_text_centered_at(text_to_draw, (tx, ty), angle, window, color=line_color_to_draw)
-
-        # DRAW VERTICES
-        for additional_key in self.V:
-            v: Vertex = self.V[additional_key]
-            cv2.circle(window, (origin[0] + v[KEY_LOCATION][0], origin[1] + v[KEY_LOCATION][1]),
-                       self.VERTEX_RADIUS, v[KEY_COLOR], -1)  # Fill
-            cv2.circle(window, (origin[0] + v[KEY_LOCATION][0], origin[1] + v[KEY_LOCATION][1]),
-                       self.VERTEX_RADIUS, (0.75, 0.75, 0.75))  # Stroke
-            cv2.putText(window, v[KEY_LABEL], (origin[0]+v[KEY_LOCATION][0]-5, origin[1]+v[KEY_LOCATION][1]+5),
-                        cv2.FONT_HERSHEY_PLAIN, 1, (0, 0, 0), 1, cv2.LINE_AA)
-
-        # DRAW CAPTION
-            if caption is not None:
-                cv2.putText(window, caption, (origin[0], origin[1]+15), cv2.FONT_HERSHEY_PLAIN, 1, (1.0, 1.0, 1.0), 1)
-
-        return window
+        from GraphDrawingFile import draw_graph  # OpenCV is only loaded once something is drawn.
+        return draw_graph(self, window=window, origin=origin, caption=caption, color=color, cut_color=cut_color)
+
+    def draw_edge(self, window: np.ndarray,
+                  e: Edge,
+                  origin: Tuple[float, float] = (0, 0),
+                  color: Tuple[float, float, float] = None,
+                  cut_color: Tuple[float, float, float] = (1.0, 0.5, 0.85),
+                  scale: float = 1.0) -> None:
+        """
+        Draws one edge of this graph (line, arrowhead and label) into the window. See GraphDrawingFile.draw_edge().
+        """
+        from GraphDrawingFile import draw_edge
+        draw_edge(self, window, e, origin=origin, color=color, cut_color=cut_color, scale=scale)
+
+    def draw_vertex(self, window: np.ndarray,
+                    v: Vertex,
+                    origin: Tuple[float, float] = (0, 0),
+                    scale: float = 1.0) -> None:
+        """
+        Draws one vertex of this graph (a filled circle with its label) into the window. See
+        GraphDrawingFile.draw_vertex().
+        """
+        from GraphDrawingFile import draw_vertex
+        draw_vertex(self, window, v, origin=origin, scale=scale)
+
+    def edge_label_text(self, e: Edge) -> str:
+        """
+        :param e: an edge in this graph
+        :return: the label drawn alongside this edge - the values of its additional keys, separated by commas.
+        """
+        text_to_draw = ""
+        for additional_key in self.additional_keys:
+            text_to_draw = f"{text_to_draw} {e[additional_key]},"
+        return text_to_draw[:-1]
 
     @staticmethod
     def draw_rotated_text_centered_at(text: str,
@@ -326,42 +456,8 @@ class DirectedGraph:
                                       window: np.ndarray,
                                       color: Tuple[float, float, float] = (1.0, 1.0, 1.0)) -> None:
         """
-        draws the given text rotated by the given amount, centered on the point given, into the window.
-        :param: text - the string to print, expected to be short enough not to cause issues in window borders
-        :param: center a tuple (cx, cy) where the text should be centered.
-        :param: angle - the angle of rotation
-        :param: window - the window into which to draw
-        :param: color - the color to draw the text, a tuple of 3 values 0.0-1.0.
-        with some help from https://www.pyimagesearch.com/2017/01/02/rotate-images-correctly-with-opencv-and-python/
-        and https://stackoverflow.com/questions/40895785/using-opencv-to-overlay-transparent-image-onto-another-image
-        """
-        M = cv2.getRotationMatrix2D((int(window.shape[0] / 2), int(window.shape[1] / 2)), angle, 1.0)
-        canvas = np.zeros(window.shape)
-        cv2.putText(canvas, text, (int(window.shape[0] / 2), int(window.shape[1] / 2)), cv2.FONT_HERSHEY_PLAIN, 1,
-                    color, 1, cv2.LINE_AA)
-        canvas = cv2.warpAffine(canvas, M, (canvas.shape[0], canvas.shape[1]))
-        mask = np.sum(canvas, axis=2)
-        horizontal_mask = np.sum(mask, axis=0)
-        nonzero_range_horizontal = np.nonzero(horizontal_mask)
-        vertical_mask = np.sum(mask, axis=1)
-        nonzero_range_vertical = np.nonzero(vertical_mask)
-        trimmed_canvas = canvas[nonzero_range_vertical[0][0] - 2:nonzero_range_vertical[0][-1] + 2,
-                                nonzero_range_horizontal[0][0] - 2:nonzero_range_horizontal[0][-1] + 2, :]
-        rows, cols, colors = trimmed_canvas.shape
-        start_x = int(center[0]-cols/2)
-        start_y = int(center[1]-rows/2)
-        if start_x < 0:
-            trimmed_canvas = trimmed_canvas[:, -start_x:]
-            start_x = 0
-        if start_y < 0:
-            trimmed_canvas = trimmed_canvas[-start_y:, :]
-            start_y = 0
-        end_x = int(center[0]+cols / 2)
-        end_y = int(center[1]+rows / 2)
-        mask = trimmed_canvas > 0
-
-        # logging.info(f"text: '{text}'\tstart_x:{start_x}\tend_x:{end_x}\tstart_y:{start_y}\tend_y:{end_y}")
-        # logging.info(f"mask shape:{mask.shape}\twindow shape:{window[start_y:end_y,start_x:end_x].shape}\t"
-        # "trimmed_canvas shape:{trimmed_canvas.shape}")
-
-        window[start_y:end_y, start_x:end_x] = (1 - mask) * window[start_y:end_y, start_x:end_x] + trimmed_canvas
+        draws the given text rotated by the given amount, centered on the point given, into the window. See
+        GraphDrawingFile.draw_rotated_text_centered_at().
+        """
+        from GraphDrawingFile import draw_rotated_text_centered_at
+        draw_rotated_text_centered_at(text, center, angle, window, color=color)
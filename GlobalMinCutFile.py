@@ -0,0 +1,246 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from TypesAndConstants import *
+from UndirectedGraphFile import UndirectedGraph
+
+# below this many (super-)vertices, Karger-Stein stops contracting and finishes exactly with Stoer-Wagner. (The
+# textbook cutoff is 6, but the recursion's overhead in python swamps the O(V^3) of a small, vectorized Stoer-Wagner.)
+BASE_CASE_SIZE: int = 24
+
+
+class GlobalMinCutSolver:
+    """
+    Finds the global minimum cut of an undirected graph - the cheapest set of edges whose removal splits the graph into
+    two pieces, with no "S" or "T" specified. This is the same answer you'd get from running find_max_flow() from one
+    vertex to each of the other V-1 vertices, but much cheaper.
+    """
+    METHOD_KARGER_STEIN = 0
+    METHOD_STOER_WAGNER = 1
+
+    def __init__(self, processes: int = None, trials: int = None, seed: int = None) -> None:
+        """
+        :param processes: how many worker processes to spread the Karger-Stein trials across. None means one per CPU;
+                          1 runs every trial in this process.
+        :param trials: how many independent Karger-Stein trials to run. None means ceil(log2(V))^2, which finds the
+                       minimum cut with high probability.
+        :param seed: seeds the random contractions, so that runs can be repeated.
+        """
+        self.processes: Optional[int] = processes
+        self.trials: Optional[int] = trials
+        self.seed: Optional[int] = seed
+
+    def find_global_min_cut(self,
+                            graph: UndirectedGraph,
+                            method: int = METHOD_KARGER_STEIN,
+                            weight_key: str = KEY_WEIGHT) -> Tuple[int, List[int]]:
+        """
+        finds the global minimum cut of the given graph.
+        :param graph: the undirected graph to cut
+        :param method: METHOD_KARGER_STEIN (randomized, run in parallel) or METHOD_STOER_WAGNER (deterministic).
+        :param weight_key: the key used to ask each edge for its weight
+        :return: cut_value - the total weight of the edges that cross the cut
+                 side - a list of the ids of the vertices on one side of the cut. (Everything else is on the other.)
+                        Like the result of find_reachable_vertices(), this can be used to color the graph by side.
+        """
+        v_ids: List[int] = sorted(graph.V)
+        if len(v_ids) < 2:
+            return 0, v_ids
+        index_for_id = {v_id: i for i, v_id in enumerate(v_ids)}
+        edges: np.ndarray = np.array([[index_for_id[e[KEY_U]], index_for_id[e[KEY_V]], e[weight_key]]
+                                      for e in graph.E.values()], dtype=np.int64).reshape(-1, 3).T
+        edges = edges[:, (edges[0] != edges[1]) & (edges[2] > 0)]  # self-loops and empty edges never cross a cut.
+
+        if method == self.METHOD_STOER_WAGNER:
+            cut_value, side_mask = stoer_wagner(len(v_ids), edges)
+        else:
+            cut_value, side_mask = self.run_karger_stein_trials(len(v_ids), edges)
+        return int(cut_value), [v_ids[i] for i in np.flatnonzero(side_mask)]
+
+    def run_karger_stein_trials(self, num_vertices: int, edges: np.ndarray) -> Tuple[int, np.ndarray]:
+        """
+        runs independent Karger-Stein trials, in parallel, and keeps the best cut any of them found. The edge arrays
+        are placed in shared memory once, rather than being pickled and sent to the workers for every trial. A graph
+        small enough that Karger-Stein would start with Stoer-Wagner is just solved by Stoer-Wagner, once.
+        :param num_vertices: the number of vertices, numbered 0 -> num_vertices-1
+        :param edges: a (3 x M) int64 array of rows u, v and weight
+        :return: the best cut value found, and a boolean mask of the vertices on one side of it.
+        """
+        if num_vertices <= BASE_CASE_SIZE:
+            return stoer_wagner(num_vertices, edges)  # every trial would go straight to this, and get the same answer.
+
+        num_trials: int = self.trials
+        if num_trials is None:
+            num_trials = math.ceil(math.log2(num_vertices)) ** 2
+        seeds: List[int] = [int(s) for s in np.random.SeedSequence(self.seed).generate_state(num_trials)]
+        processes: int = self.processes if self.processes is not None else (os.cpu_count() or 1)
+
+        if processes <= 1 or num_trials == 1:
+            results = [karger_stein_trial(num_vertices, edges, seed) for seed in seeds]
+        else:
+            shared = shared_memory.SharedMemory(create=True, size=max(edges.nbytes, 1))
+            try:
+                np.ndarray(edges.shape, dtype=np.int64, buffer=shared.buf)[:] = edges
+                with ProcessPoolExecutor(max_workers=min(processes, num_trials)) as executor:
+                    results = list(executor.map(_shared_memory_trial,
+                                                [shared.name] * num_trials,
+                                                [num_vertices] * num_trials,
+                                                [edges.shape[1]] * num_trials,
+                                                seeds))
+            finally:
+                shared.close()
+                shared.unlink()
+
+        return min(results, key=lambda result: result[0])
+
+
+def _shared_memory_trial(shm_name: str, num_vertices: int, num_edges: int, seed: int) -> Tuple[int, np.ndarray]:
+    """
+    the worker-process side of run_karger_stein_trials(): attaches to the shared edge arrays and runs one trial.
+    """
+    shared = shared_memory.SharedMemory(name=shm_name)
+    try:
+        edges: np.ndarray = np.ndarray((3, num_edges), dtype=np.int64, buffer=shared.buf)
+        result: Tuple[int, np.ndarray] = karger_stein_trial(num_vertices, edges, seed)
+        del edges  # the buffer can't be closed while an array still points into it.
+        return result
+    finally:
+        shared.close()
+
+
+def karger_stein_trial(num_vertices: int, edges: np.ndarray, seed: int) -> Tuple[int, np.ndarray]:
+    """
+    one run of the Karger-Stein recursive contraction algorithm. This finds a minimum cut with probability
+    Omega(1/log V), in O(V^2 log V) time.
+    :param num_vertices: the number of vertices, numbered 0 -> num_vertices-1
+    :param edges: a (3 x M) int64 array of rows u, v and weight
+    :param seed: seed for this trial's random number generator
+    :return: the value of the cut found, and a boolean mask of the vertices on one side of it.
+    """
+    return _karger_stein(num_vertices, edges, np.random.default_rng(seed))
+
+
+def _karger_stein(num_vertices: int, edges: np.ndarray, rng: np.random.Generator) -> Tuple[int, np.ndarray]:
+    if edges.shape[1] == 0:  # nothing joins these vertices, so cutting any one of them off is free.
+        mask: np.ndarray = np.zeros(num_vertices, dtype=bool)
+        mask[0] = True
+        return 0, mask
+    if num_vertices <= BASE_CASE_SIZE:
+        return stoer_wagner(num_vertices, edges)
+
+    target: int = math.ceil(1 + num_vertices / math.sqrt(2))
+    best_value: Optional[int] = None
+    best_mask: Optional[np.ndarray] = None
+    for _ in range(2):
+        mapping, contracted_edges = contract(num_vertices, edges, target, rng)
+        value, contracted_mask = _karger_stein(int(mapping.max()) + 1, contracted_edges, rng)
+        if best_value is None or value < best_value:
+            best_value = value
+            best_mask = contracted_mask[mapping]  # un-contract: each vertex goes to the side of its super-vertex.
+    return best_value, best_mask
+
+
+def contract(num_vertices: int,
+             edges: np.ndarray,
+             target: int,
+             rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    randomly contracts edges, each chosen with probability proportional to its weight, until only "target" vertices
+    remain (or nothing more can be contracted.) Giving every edge an exponential "arrival time" with rate equal to its
+    weight and contracting in order of arrival is equivalent to repeatedly picking a random remaining edge by weight.
+    :param num_vertices: the number of vertices, numbered 0 -> num_vertices-1
+    :param edges: a (3 x M) int64 array of rows u, v and weight
+    :param target: the number of vertices to stop at
+    :param rng: the random number generator to use
+    :return: mapping - for each vertex, the id (0 -> target-1) of the super-vertex it was contracted into
+             contracted_edges - the (3 x M') edges between super-vertices, with parallel edges combined.
+    """
+    parent: List[int] = list(range(num_vertices))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    components: int = num_vertices
+    order: np.ndarray = np.argsort(rng.exponential(size=edges.shape[1]) / edges[2])
+    us: List[int] = edges[0].tolist()
+    vs: List[int] = edges[1].tolist()
+    for e in order.tolist():
+        if components <= target:
+            break
+        root_u: int = find(us[e])
+        root_v: int = find(vs[e])
+        if root_u != root_v:
+            parent[root_u] = root_v
+            components -= 1
+
+    roots: np.ndarray = np.array([find(x) for x in range(num_vertices)], dtype=np.int64)
+    _, mapping = np.unique(roots, return_inverse=True)
+    u: np.ndarray = mapping[edges[0]]
+    v: np.ndarray = mapping[edges[1]]
+    keep: np.ndarray = u != v
+    low: np.ndarray = np.minimum(u[keep], v[keep])
+    high: np.ndarray = np.maximum(u[keep], v[keep])
+    pairs, pair_index = np.unique(low * components + high, return_inverse=True)
+    weights: np.ndarray = np.bincount(pair_index, weights=edges[2][keep], minlength=len(pairs)).astype(np.int64)
+    return mapping, np.stack([pairs // components, pairs % components, weights]).astype(np.int64)
+
+
+def stoer_wagner(num_vertices: int, edges: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    the deterministic Stoer-Wagner minimum cut algorithm, on a dense adjacency matrix. O(V^3) time, O(V^2) memory, so
+    best for small or dense graphs - Karger-Stein uses it to finish off its recursion.
+    :param num_vertices: the number of vertices, numbered 0 -> num_vertices-1
+    :param edges: a (3 x M) int64 array of rows u, v and weight
+    :return: the value of the minimum cut, and a boolean mask of the vertices on one side of it.
+    """
+    adjacency: np.ndarray = np.zeros((num_vertices, num_vertices), dtype=np.int64)
+    np.add.at(adjacency, (edges[0], edges[1]), edges[2])
+    np.add.at(adjacency, (edges[1], edges[0]), edges[2])
+    np.fill_diagonal(adjacency, 0)
+
+    members: List[List[int]] = [[i] for i in range(num_vertices)]  # which original vertices each one stands for.
+    active: np.ndarray = np.ones(num_vertices, dtype=bool)
+    best_value: Optional[int] = None
+    best_members: List[int] = []
+
+    for _ in range(num_vertices - 1):
+        # "maximum adjacency" ordering: keep adding the vertex most tightly connected to those added so far.
+        start: int = int(np.flatnonzero(active)[0])
+        added: np.ndarray = ~active
+        added[start] = True
+        connection: np.ndarray = adjacency[start].copy()
+        previous: int = start
+        last: int = start
+        cut_of_phase: int = 0
+        while not added.all():
+            candidates: np.ndarray = np.where(added, -1, connection)
+            previous, last = last, int(np.argmax(candidates))
+            cut_of_phase = int(candidates[last])
+            added[last] = True
+            connection += adjacency[last]
+
+        # the cut between "last" and everything else is the best s-t cut for this phase.
+        if best_value is None or cut_of_phase < best_value:
+            best_value = cut_of_phase
+            best_members = list(members[last])
+
+        # merge "last" into "previous".
+        adjacency[previous] += adjacency[last]
+        adjacency[:, previous] += adjacency[:, last]
+        adjacency[previous, previous] = 0
+        adjacency[last] = 0
+        adjacency[:, last] = 0
+        active[last] = False
+        members[previous].extend(members[last])
+
+    mask: np.ndarray = np.zeros(num_vertices, dtype=bool)
+    mask[best_members] = True
+    return best_value, mask
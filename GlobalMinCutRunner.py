@@ -0,0 +1,26 @@
+import cv2
+from TypesAndConstants import *
+from UndirectedGraphFile import UndirectedGraph
+from GlobalMinCutFile import GlobalMinCutSolver
+
+
+def main():
+    graph: UndirectedGraph = UndirectedGraph(filename="UndirectedGraph1.txt")
+    solver: GlobalMinCutSolver = GlobalMinCutSolver()
+    cut_value, side = solver.find_global_min_cut(graph, method=GlobalMinCutSolver.METHOD_KARGER_STEIN)
+
+    for v_id in graph.V:
+        if v_id in side:
+            graph.V[v_id][KEY_COLOR] = (0.25, 0.75, 1.0)
+        else:
+            graph.V[v_id][KEY_COLOR] = (1.0, 0.75, 0.25)
+
+    print(f"Global min cut: {cut_value}\tOne side: {side}")
+    window = graph.draw_self(caption=f"Global min cut: {cut_value}", color=(0.75, 1.0, 0.25))
+    cv2.imshow("Global Min Cut", window)
+    cv2.waitKey()
+
+
+# if this is the file you are telling to run, then call main().
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""
+The drawing code for DirectedGraph and UndirectedGraph. This is kept apart from the graphs themselves, so that
+programs that only build and solve graphs never have to import OpenCV; DirectedGraph imports this module the first time
+it is asked to draw.
+"""
+import math
+import random
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+from TypesAndConstants import *
+from DirectedGraphFile import DirectedGraph
+
+
+def draw_graph(graph: DirectedGraph,
+               window: np.ndarray = None,
+               origin: Tuple[int, int] = (0, 0),
+               caption: str = None,
+               color: Tuple[float, float, float] = None,
+               cut_color: Tuple[float, float, float] = (1.0, 0.5, 0.85)) -> np.ndarray:
+    """
+    Draws the graph in the given window (or a new, 800 x 800 one), potentially with a caption
+    :param graph: the graph to draw
+    :param window: the numpy Array in which to draw. Should be a (h x w x 3) np array, with values 0.0-1.0. (
+                    Or None, and one will be created for you.)
+    :param origin: An offset for this graph, so that you can draw more than one per window
+    :param caption: An optional piece of text to draw at (0,15) for this plot.
+    :param color: A BGR tuple [0.0-1.0) for the standard color of this edge.
+    :param cut_color: A BGR tuple [0.0-1.0) for the color of this edge if is cut.
+    :return: the window in which this was drawn
+    """
+    if window is None:
+        window = np.zeros([800, 800, 3], dtype=float)
+
+    # DRAW EDGES
+    for key in graph.E:
+        draw_edge(graph, window, graph.E[key], origin=origin, color=color, cut_color=cut_color)
+
+    # DRAW VERTICES
+    for v_id in graph.V:
+        draw_vertex(graph, window, graph.V[v_id], origin=origin)
+
+    # DRAW CAPTION
+    if caption is not None:
+        cv2.putText(window, caption, (origin[0], origin[1]+15), cv2.FONT_HERSHEY_PLAIN, 1, (1.0, 1.0, 1.0), 1)
+
+    return window
+
+
+def draw_edge(graph: DirectedGraph,
+              window: np.ndarray,
+              e: Edge,
+              origin: Tuple[float, float] = (0, 0),
+              color: Tuple[float, float, float] = None,
+              cut_color: Tuple[float, float, float] = (1.0, 0.5, 0.85),
+              scale: float = 1.0) -> None:
+    """
+    Draws one edge of the graph (line, arrowhead and label) into the window.
+    :param graph: the graph the edge belongs to
+    :param window: the numpy Array in which to draw.
+    :param e: the edge to draw
+    :param origin: where, in the window, the point (0, 0) of this graph should be drawn
+    :param color: A BGR tuple [0.0-1.0) for the standard color of this edge, or None for a random color.
+    :param cut_color: A BGR tuple [0.0-1.0) for the color of this edge if is cut.
+    :param scale: how many pixels to draw for each unit of vertex location (i.e., the zoom.)
+    :return: None
+    """
+    u: Vertex = graph.V[e[KEY_U]]
+    v: Vertex = graph.V[e[KEY_V]]
+    u_x: float = origin[0] + u[KEY_LOCATION][0] * scale
+    u_y: float = origin[1] + u[KEY_LOCATION][1] * scale
+    v_x: float = origin[0] + v[KEY_LOCATION][0] * scale
+    v_y: float = origin[1] + v[KEY_LOCATION][1] * scale
+    dx: float = u_x - v_x
+    dy: float = u_y - v_y
+    d: float = np.sqrt(dx**2 + dy**2)
+    # logging.info(f"u={u}\tv={v}\tdx={dx}\tdy={dy}\d={d}")
+    if d <= 2*graph.VERTEX_RADIUS:
+        return
+    i: Tuple[float, float] = (dx/d, dy/d)
+    j: Tuple[float, float] = (-i[1], i[0])
+    # logging.info(f"i={i}\tj={j}")
+    if color is None:
+        line_color_to_draw: Tuple[float, float, float] = (random.randrange(25, 100)/100,
+                                                          random.randrange(25, 100)/100,
+                                                          random.randrange(25, 100)/100)
+    else:
+        if u[KEY_COLOR] == v[KEY_COLOR]:
+            line_color_to_draw = color
+        else:
+            line_color_to_draw = cut_color
+    point_u = (math.floor(u_x - i[0]*graph.VERTEX_RADIUS + j[0]*graph.EDGE_OFFSET),
+               math.floor(u_y - i[1]*graph.VERTEX_RADIUS + j[1]*graph.EDGE_OFFSET))
+
+    point_v = (math.floor(v_x + i[0] * graph.VERTEX_RADIUS + j[0] * graph.EDGE_OFFSET),
+               math.floor(v_y + i[1] * graph.VERTEX_RADIUS + j[1] * graph.EDGE_OFFSET))
+    cv2.line(window, point_u, point_v, line_color_to_draw, 1)
+
+    # draw arrowheads
+    if graph.i_am_directed:
+        a1 = (math.floor(point_v[0] + i[0] * graph.ARROW_SIZE + j[0] * graph.ARROW_SIZE),
+              math.floor(point_v[1] + i[1] * graph.ARROW_SIZE + j[1] * graph.ARROW_SIZE))
+        a2 = (math.floor(point_v[0] + i[0] * graph.ARROW_SIZE - j[0] * graph.ARROW_SIZE),
+              math.floor(point_v[1] + i[1] * graph.ARROW_SIZE - j[1] * graph.ARROW_SIZE))
+        cv2.line(window, point_v, a1, line_color_to_draw, 1)
+        cv2.line(window, point_v, a2, line_color_to_draw, 1)
+        cv2.line(window, a1, a2, line_color_to_draw, 1)
+
+    # draw edge labels
+    angle = np.arctan2(dy, -dx) * 180 / np.pi
+    tx = math.floor((v_x + u_x) / 2 + j[0] * graph.TEXT_OFFSET)
+    ty = math.floor((v_y + u_y) / 2 + j[1] * graph.TEXT_OFFSET)
+
+    if len(graph.additional_keys) > 0:
+        draw_rotated_text_centered_at(graph.edge_label_text(e), (tx, ty), angle, window, color=line_color_to_draw)
+
+
+def draw_vertex(graph: DirectedGraph,
+                window: np.ndarray,
+                v: Vertex,
+                origin: Tuple[float, float] = (0, 0),
+                scale: float = 1.0) -> None:
+    """
+    Draws one vertex of the graph (a filled circle with its label) into the window.
+    :param graph: the graph the vertex belongs to
+    :param window: the numpy Array in which to draw.
+    :param v: the vertex to draw
+    :param origin: where, in the window, the point (0, 0) of this graph should be drawn
+    :param scale: how many pixels to draw for each unit of vertex location (i.e., the zoom.)
+    :return: None
+    """
+    center: Tuple[int, int] = (math.floor(origin[0] + v[KEY_LOCATION][0] * scale),
+                               math.floor(origin[1] + v[KEY_LOCATION][1] * scale))
+    cv2.circle(window, center, graph.VERTEX_RADIUS, v[KEY_COLOR], -1)  # Fill
+    cv2.circle(window, center, graph.VERTEX_RADIUS, (0.75, 0.75, 0.75))  # Stroke
+    cv2.putText(window, v[KEY_LABEL], (center[0]-5, center[1]+5),
+                cv2.FONT_HERSHEY_PLAIN, 1, (0, 0, 0), 1, cv2.LINE_AA)
+
+
+def draw_rotated_text_centered_at(text: str,
+                                  center: Tuple[float, float],
+                                  angle: float,
+                                  window: np.ndarray,
+                                  color: Tuple[float, float, float] = (1.0, 1.0, 1.0)) -> None:
+    """
+    draws the given text rotated by the given amount, centered on the point given, into the window.
+    :param: text - the string to print. Any part of it that falls outside the window is clipped.
+    :param: center a tuple (cx, cy) where the text should be centered.
+    :param: angle - the angle of rotation
+    :param: window - the window into which to draw
+    :param: color - the color to draw the text, a tuple of 3 values 0.0-1.0.
+    with some help from https://www.pyimagesearch.com/2017/01/02/rotate-images-correctly-with-opencv-and-python/
+    and https://stackoverflow.com/questions/40895785/using-opencv-to-overlay-transparent-image-onto-another-image
+    """
+    # the canvas only needs to be big enough to hold the text at any angle, not as big as the window.
+    (text_width, text_height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_PLAIN, 1, 1)
+    half_size: int = text_width + text_height + baseline + 4
+    M = cv2.getRotationMatrix2D((half_size, half_size), angle, 1.0)
+    canvas = np.zeros((2 * half_size, 2 * half_size, 3), dtype=window.dtype)
+    cv2.putText(canvas, text, (half_size, half_size), cv2.FONT_HERSHEY_PLAIN, 1,
+                color, 1, cv2.LINE_AA)
+    canvas = cv2.warpAffine(canvas, M, (canvas.shape[1], canvas.shape[0]))
+    mask = np.sum(canvas, axis=2)
+    horizontal_mask = np.sum(mask, axis=0)
+    nonzero_range_horizontal = np.nonzero(horizontal_mask)
+    vertical_mask = np.sum(mask, axis=1)
+    nonzero_range_vertical = np.nonzero(vertical_mask)
+    if len(nonzero_range_horizontal[0]) == 0:  # nothing to draw.
+        return
+    trimmed_canvas = canvas[max(0, nonzero_range_vertical[0][0] - 2):nonzero_range_vertical[0][-1] + 2,
+                            max(0, nonzero_range_horizontal[0][0] - 2):nonzero_range_horizontal[0][-1] + 2, :]
+    rows, cols, colors = trimmed_canvas.shape
+    start_x = math.floor(center[0]-cols/2)
+    start_y = math.floor(center[1]-rows/2)
+    # clip the text to the window, on all four sides, so that text near (or past) an edge is cut off.
+    end_x = min(start_x + cols, window.shape[1])
+    end_y = min(start_y + rows, window.shape[0])
+    if start_x < 0:
+        trimmed_canvas = trimmed_canvas[:, -start_x:]
+        start_x = 0
+    if start_y < 0:
+        trimmed_canvas = trimmed_canvas[-start_y:, :]
+        start_y = 0
+    if end_x <= start_x or end_y <= start_y:
+        return
+    trimmed_canvas = trimmed_canvas[:end_y - start_y, :end_x - start_x]
+    mask = trimmed_canvas > 0
+
+    # logging.info(f"text: '{text}'\tstart_x:{start_x}\tend_x:{end_x}\tstart_y:{start_y}\tend_y:{end_y}")
+    # logging.info(f"mask shape:{mask.shape}\twindow shape:{window[start_y:end_y,start_x:end_x].shape}\t"
+    # "trimmed_canvas shape:{trimmed_canvas.shape}")
+
+    window[start_y:end_y, start_x:end_x] = (1 - mask) * window[start_y:end_y, start_x:end_x] + trimmed_canvas
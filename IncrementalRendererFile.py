@@ -0,0 +1,314 @@
+import math
+import random
+from typing import Dict, List, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+from TypesAndConstants import *
+from DirectedGraphFile import DirectedGraph
+
+Rect = Tuple[int, int, int, int]  # (left, top, right, bottom), in pixels within a panel. right and bottom exclusive.
+EdgeKey = Tuple[int, int, int]  # (u, v, n) for the n-th edge from u to v - edge ids change when graphs are rebuilt.
+
+
+class PanelCache:
+    """
+    What an IncrementalRenderer remembers about one panel since it was last drawn.
+    """
+
+    def __init__(self, origin: Tuple[int, int], size: Tuple[int, int]) -> None:
+        self.origin: Tuple[int, int] = origin
+        self.size: Tuple[int, int] = size
+        self.static_signature: Optional[tuple] = None  # the vertices, keys, caption and colors of the last frame.
+        self.edge_signatures: Dict[EdgeKey, tuple] = {}  # the label and color each edge was drawn with.
+        self.edge_bounds: Dict[EdgeKey, Rect] = {}  # where each edge was drawn.
+        self.vertex_bounds: np.ndarray = np.zeros((0, 4), dtype=np.int64)
+        self.caption_bounds: Optional[Rect] = None
+        self.random_colors: Dict[EdgeKey, Tuple[float, float, float]] = {}  # so color=None doesn't change per frame.
+        self.edge_grid: RectGrid = RectGrid()  # the keys of edge_bounds, by where they were drawn.
+
+
+class RectGrid:
+    """
+    A uniform grid of square cells over a panel, holding a set of keyed rectangles, so that the ones overlapping a
+    given rectangle can be found without checking all of them. Each rectangle is filed under every cell it touches.
+    (Like SpatialGrid, but over pixel rectangles that change a few at a time, rather than over a whole graph.)
+    """
+
+    def __init__(self, cell_size: int = 32) -> None:
+        self.cell_size: int = cell_size
+        self.cells: Dict[Tuple[int, int], Set[EdgeKey]] = {}
+
+    def cells_overlapping(self, rect: Rect) -> List[Tuple[int, int]]:
+        """
+        :return: the (column, row) of every cell that overlaps the rectangle.
+        """
+        return [(column, row)
+                for column in range(rect[0] // self.cell_size, (rect[2] - 1) // self.cell_size + 1)
+                for row in range(rect[1] // self.cell_size, (rect[3] - 1) // self.cell_size + 1)]
+
+    def add(self, key: EdgeKey, rect: Rect) -> None:
+        for cell in self.cells_overlapping(rect):
+            self.cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key: EdgeKey, rect: Rect) -> None:
+        for cell in self.cells_overlapping(rect):
+            self.cells[cell].discard(key)
+
+    def keys_near(self, rect: Rect) -> Set[EdgeKey]:
+        """
+        :return: the keys of the rectangles that share a cell with the given one - a superset of those overlapping it.
+        """
+        found: Set[EdgeKey] = set()
+        for cell in self.cells_overlapping(rect):
+            found.update(self.cells.get(cell, ()))
+        return found
+
+
+class IncrementalRenderer:
+    """
+    Keeps one window of graph panels between frames. The first time a panel is drawn (or whenever its vertices, keys,
+    caption or colors change) it is drawn in full; after that, only the rectangles covered by edges that were added,
+    removed, or drawn with a different color are cleared and redrawn (or, for an edge that only has a new label, just
+    the label's rectangle) - along with whatever else overlaps them. So the cost of a frame scales with how much
+    changed, rather than with the size of the graph. Each frame, every edge that needs redrawing is drawn once, however
+    many of the changed rectangles it overlaps, and the edges to check are found with a RectGrid; when so much has
+    changed that this would approach a full redraw, the panel is simply drawn in full.
+    """
+    # if more than this fraction of a panel's edges were added, removed or changed, redraw the whole panel.
+    FULL_REDRAW_FRACTION: float = 0.25
+
+    def __init__(self, width: int = 800, height: int = 800) -> None:
+        self.window: np.ndarray = np.zeros([height, width, 3], dtype=float)
+        self.panels: Dict[str, PanelCache] = {}
+        self.full_redraws: int = 0  # how many times a panel was drawn from scratch.
+        self.edges_redrawn: int = 0  # how many edges have been rasterized, in total.
+
+    def draw_panel(self,
+                   name: str,
+                   graph: DirectedGraph,
+                   origin: Tuple[int, int] = (0, 0),
+                   caption: str = None,
+                   color: Tuple[float, float, float] = None,
+                   cut_color: Tuple[float, float, float] = (1.0, 0.5, 0.85),
+                   size: Tuple[int, int] = (400, 400)) -> np.ndarray:
+        """
+        brings the named panel of the window up to date with the given graph - the same picture that
+        graph.draw_self(origin=origin, caption=caption, color=color, cut_color=cut_color) would draw, clipped to the
+        panel. (With color=None, each edge keeps the random color it was first given.)
+        :param name: which panel this is, e.g., "capacity". Each name keeps its own cache.
+        :param graph: what to draw in it. This may be a different object each frame.
+        :param origin: the top-left corner of the panel, in the window
+        :param caption: An optional piece of text to draw at the top-left of the panel.
+        :param color: A BGR tuple [0.0-1.0) for the standard color of the edges.
+        :param cut_color: A BGR tuple [0.0-1.0) for the color of the edges that are cut.
+        :param size: the (width, height) of the panel
+        :return: the window
+        """
+        panel: Optional[PanelCache] = self.panels.get(name)
+        if panel is None or panel.origin != origin or panel.size != size:
+            panel = PanelCache(origin, size)
+            self.panels[name] = panel
+        region: np.ndarray = self.window[origin[1]:origin[1] + size[1], origin[0]:origin[0] + size[0]]
+
+        static_signature: tuple = (tuple((v_id, v[KEY_LABEL], v[KEY_LOCATION], v[KEY_COLOR])
+                                         for v_id, v in graph.V.items()),
+                                   graph.i_am_directed, tuple(graph.additional_keys), caption, color, cut_color)
+        edges: List[Tuple[EdgeKey, Edge, Tuple[float, float, float]]] = []
+        signatures: Dict[EdgeKey, tuple] = {}
+        count_for_pair: Dict[Tuple[int, int], int] = {}
+        edge_for_key: Dict[EdgeKey, Edge] = {}
+        for e in graph.E.values():
+            pair: Tuple[int, int] = (e[KEY_U], e[KEY_V])
+            key: EdgeKey = (pair[0], pair[1], count_for_pair.get(pair, 0))
+            count_for_pair[pair] = key[2] + 1
+            if color is None:
+                edge_color = panel.random_colors.setdefault(key, (random.randrange(25, 100) / 100,
+                                                                  random.randrange(25, 100) / 100,
+                                                                  random.randrange(25, 100) / 100))
+            else:
+                edge_color = color
+            edges.append((key, e, edge_color))
+            edge_for_key[key] = e
+            signatures[key] = (graph.edge_label_text(e) if len(graph.additional_keys) > 0 else "", edge_color)
+
+        dirty_keys: Set[EdgeKey] = ({key for key in panel.edge_signatures if key not in signatures} |
+                                    {key for key in signatures if panel.edge_signatures.get(key) != signatures[key]})
+        if (static_signature != panel.static_signature or
+                len(dirty_keys) > self.FULL_REDRAW_FRACTION * max(len(edges), len(panel.edge_signatures))):
+            # DRAW EVERYTHING
+            self.full_redraws += 1
+            panel.static_signature = static_signature
+            panel.vertex_bounds = np.array([self.vertex_bounds(graph, v) for v in graph.V.values()],
+                                           dtype=np.int64).reshape(-1, 4)
+            panel.caption_bounds = self.caption_bounds(caption)
+            panel.edge_bounds = {key: self.edge_bounds(graph, e, signatures[key][0]) for key, e, _ in edges}
+            panel.edge_grid = RectGrid()
+            for key, rect in panel.edge_bounds.items():
+                panel.edge_grid.add(key, rect)
+            panel.edge_signatures = signatures
+            self.redraw_rects(region, panel, graph, edges, [(0, 0, size[0], size[1])], caption, color, cut_color)
+            return self.window
+
+        # DRAW ONLY WHAT CHANGED
+        dirty: List[Rect] = []
+        for key in dirty_keys:
+            old: Optional[tuple] = panel.edge_signatures.get(key)
+            new: Optional[tuple] = signatures.get(key)
+            if old is not None and new is not None and old[1] == new[1]:
+                # only the label changed. The line and arrowhead are the same pixels, so clear just the old label.
+                dirty.append(self.label_bounds(graph, edge_for_key[key], old[0]))
+            elif old is not None:  # removed or recolored: clear all of it.
+                dirty.append(panel.edge_bounds[key])
+            if key in panel.edge_bounds:
+                panel.edge_grid.remove(key, panel.edge_bounds.pop(key))
+        for key, e, _ in edges:
+            if key in dirty_keys:  # added or changed: draw where it is now.
+                panel.edge_bounds[key] = self.edge_bounds(graph, e, signatures[key][0])
+                panel.edge_grid.add(key, panel.edge_bounds[key])
+                if key in panel.edge_signatures and panel.edge_signatures[key][1] == signatures[key][1]:
+                    dirty.append(self.label_bounds(graph, e, signatures[key][0]))
+                else:
+                    dirty.append(panel.edge_bounds[key])
+        panel.edge_signatures = signatures
+        # a relabeled edge's old and new labels are often the same size, so only keep each rectangle once.
+        dirty = [rect for rect in dict.fromkeys(dirty) if rect is not None]
+        self.redraw_rects(region, panel, graph, edges, dirty, caption, color, cut_color)
+        return self.window
+
+    def clear_panel(self, name: str, origin: Tuple[int, int] = (0, 0), size: Tuple[int, int] = (400, 400)) -> None:
+        """
+        blanks the named panel, and forgets what was drawn there.
+        """
+        self.window[origin[1]:origin[1] + size[1], origin[0]:origin[0] + size[0]] = 0
+        self.panels.pop(name, None)
+
+    def redraw_rects(self,
+                     region: np.ndarray,
+                     panel: PanelCache,
+                     graph: DirectedGraph,
+                     edges: List[Tuple[EdgeKey, Edge, Tuple[float, float, float]]],
+                     rects: List[Rect],
+                     caption: Optional[str],
+                     color: Optional[Tuple[float, float, float]],
+                     cut_color: Tuple[float, float, float]) -> None:
+        """
+        clears some rectangles of a panel and redraws everything that overlaps any of them, in the same order as
+        draw_self - so the pixels come out the same as if the whole panel had been drawn. Everything is drawn once, in a
+        single scratch window big enough to hold all of each of those edges and vertices (so that OpenCV never clips a
+        line partway, which would shift its pixels), and then just the rectangles are copied into the panel.
+        """
+        clipped: List[Rect] = []
+        for rect in rects:
+            left, top = max(rect[0], 0), max(rect[1], 0)
+            right, bottom = min(rect[2], region.shape[1]), min(rect[3], region.shape[0])
+            if right > left and bottom > top:
+                clipped.append((left, top, right, bottom))
+        if len(clipped) == 0:
+            return
+
+        nearby: Set[EdgeKey] = set()
+        for rect in clipped:
+            nearby |= {key for key in panel.edge_grid.keys_near(rect) if self.overlaps(panel.edge_bounds[key], rect)}
+        edges_to_draw = [(key, e, edge_color) for key, e, edge_color in edges if key in nearby]
+        bounds: np.ndarray = panel.vertex_bounds
+        areas: np.ndarray = np.array(clipped, dtype=np.int64)
+        vertices_to_draw: np.ndarray = ((bounds[:, None, 0] < areas[None, :, 2]) &
+                                        (bounds[:, None, 2] > areas[None, :, 0]) &
+                                        (bounds[:, None, 1] < areas[None, :, 3]) &
+                                        (bounds[:, None, 3] > areas[None, :, 1])).any(axis=1)
+        draw_caption: bool = caption is not None and any(self.overlaps(panel.caption_bounds, rect) for rect in clipped)
+
+        everything: List[Rect] = (clipped + [panel.edge_bounds[key] for key, _, _ in edges_to_draw] +
+                                  [tuple(b) for b in bounds[vertices_to_draw]] +
+                                  ([panel.caption_bounds] if draw_caption else []))
+        scratch_left, scratch_top = min(r[0] for r in everything), min(r[1] for r in everything)
+        scratch_right, scratch_bottom = max(r[2] for r in everything), max(r[3] for r in everything)
+        scratch: np.ndarray = np.zeros([scratch_bottom - scratch_top, scratch_right - scratch_left, 3],
+                                       dtype=region.dtype)
+        origin: Tuple[int, int] = (-scratch_left, -scratch_top)
+
+        for key, e, edge_color in edges_to_draw:
+            graph.draw_edge(scratch, e, origin=origin, color=edge_color,
+                            cut_color=cut_color if color is not None else edge_color)
+        self.edges_redrawn += len(edges_to_draw)
+        for v, to_draw in zip(graph.V.values(), vertices_to_draw):
+            if to_draw:
+                graph.draw_vertex(scratch, v, origin=origin)
+        if draw_caption:
+            cv2.putText(scratch, caption, (origin[0], origin[1] + 15), cv2.FONT_HERSHEY_PLAIN, 1, (1.0, 1.0, 1.0), 1)
+
+        for left, top, right, bottom in clipped:
+            region[top:bottom, left:right] = scratch[top - scratch_top:bottom - scratch_top,
+                                                     left - scratch_left:right - scratch_left]
+
+    @staticmethod
+    def overlaps(a: Rect, b: Rect) -> bool:
+        return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+    @staticmethod
+    def edge_bounds(graph: DirectedGraph, e: Edge, text: str) -> Rect:
+        """
+        :return: a rectangle holding everything draw_edge() draws for this edge - line, arrowhead and label.
+        """
+        u_x, u_y = graph.V[e[KEY_U]][KEY_LOCATION]
+        v_x, v_y = graph.V[e[KEY_V]][KEY_LOCATION]
+        dx, dy = u_x - v_x, u_y - v_y
+        d: float = np.sqrt(dx ** 2 + dy ** 2)
+        if d <= 2 * graph.VERTEX_RADIUS:  # draw_edge() draws nothing.
+            return int(u_x), int(u_y), int(u_x), int(u_y)
+        # the ends of the line, as in draw_edge(): pulled VERTEX_RADIUS in from each vertex, and EDGE_OFFSET aside.
+        i_x, i_y = dx / d, dy / d
+        points_x = [u_x - i_x * graph.VERTEX_RADIUS - i_y * graph.EDGE_OFFSET,
+                    v_x + i_x * graph.VERTEX_RADIUS - i_y * graph.EDGE_OFFSET]
+        points_y = [u_y - i_y * graph.VERTEX_RADIUS + i_x * graph.EDGE_OFFSET,
+                    v_y + i_y * graph.VERTEX_RADIUS + i_x * graph.EDGE_OFFSET]
+        # the arrowhead reaches at most ARROW_SIZE * sqrt(2) from the end of the line; 2 more covers the rounding.
+        pad: int = (graph.ARROW_SIZE * 3 // 2 if graph.i_am_directed else 0) + 2
+        left, top = min(points_x) - pad, min(points_y) - pad
+        right, bottom = max(points_x) + pad, max(points_y) + pad
+        label: Optional[Rect] = IncrementalRenderer.label_bounds(graph, e, text)
+        if label is not None:
+            left, top = min(left, label[0]), min(top, label[1])
+            right, bottom = max(right, label[2]), max(bottom, label[3])
+        return math.floor(left), math.floor(top), math.floor(right) + 1, math.floor(bottom) + 1
+
+    @staticmethod
+    def label_bounds(graph: DirectedGraph, e: Edge, text: str) -> Optional[Rect]:
+        """
+        :return: a rectangle holding just the label draw_edge() draws for this edge, or None if it draws no label.
+        """
+        u_x, u_y = graph.V[e[KEY_U]][KEY_LOCATION]
+        v_x, v_y = graph.V[e[KEY_V]][KEY_LOCATION]
+        dx, dy = u_x - v_x, u_y - v_y
+        d: float = np.sqrt(dx ** 2 + dy ** 2)
+        if len(text) == 0 or d <= 2 * graph.VERTEX_RADIUS:
+            return None
+        # the same center as draw_edge() uses: TEXT_OFFSET to the side of the midpoint.
+        center_x: int = math.floor((v_x + u_x) / 2 - dy / d * graph.TEXT_OFFSET)
+        center_y: int = math.floor((v_y + u_y) / 2 + dx / d * graph.TEXT_OFFSET)
+        (text_width, text_height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_PLAIN, 1, 1)
+        pad: int = int(np.hypot(text_width, text_height + baseline) / 2) + 4  # the text may be at any angle.
+        return center_x - pad, center_y - pad, center_x + pad + 1, center_y + pad + 1
+
+    @staticmethod
+    def vertex_bounds(graph: DirectedGraph, v: Vertex) -> Rect:
+        """
+        :return: a rectangle holding everything draw_vertex() draws for this vertex - circle and label.
+        """
+        x, y = v[KEY_LOCATION]
+        (text_width, text_height), baseline = cv2.getTextSize(v[KEY_LABEL], cv2.FONT_HERSHEY_PLAIN, 1, 1)
+        pad: int = graph.VERTEX_RADIUS + 2
+        return (int(min(x - pad, x - 7)), int(min(y - pad, y + 3 - text_height)),
+                int(max(x + pad, x - 3 + text_width)), int(max(y + pad, y + 7 + baseline)))
+
+    @staticmethod
+    def caption_bounds(caption: Optional[str]) -> Rect:
+        """
+        :return: a rectangle holding the caption, drawn at (0, 15).
+        """
+        if caption is None:
+            return 0, 0, 0, 0
+        (text_width, text_height), baseline = cv2.getTextSize(caption, cv2.FONT_HERSHEY_PLAIN, 1, 1)
+        return 0, 0, text_width + 2, 17 + baseline
@@ -1,9 +1,8 @@
 import random
-
-import cv2
 import heapq
 
 from UndirectedGraphFile import UndirectedGraph
+from SolutionCacheFile import SolutionCache
 from TypesAndConstants import *
 from typing import List, Set, Dict, Optional
 import numpy as np
@@ -14,17 +13,33 @@ class MST:
     METHOD_PRIMS = 1
 
     def __init__(self,
-                 G: UndirectedGraph):
+                 G: UndirectedGraph,
+                 cache: SolutionCache = None):
         self.source_G: UndirectedGraph = G
+        self.cache: Optional[SolutionCache] = cache  # if given, solve() reuses results for graphs it has seen before.
         self.MST_result: Optional[UndirectedGraph] = None  # "Optional" means "could be None or what's in the brackets."
         self.disjoint_set: Dict[int, List[int, int]] = {}  # {this_id: [parent_id, this_rank]}  -1 means No parent.
+        self.renderer = None  # an IncrementalRenderer, so update_window() only redraws what changed. Made (along with
+        #                       loading OpenCV) the first time it is needed.
 
     def solve(self, method: int) -> None:
+        cache_key: Optional[str] = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.source_G, "MST", method)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                cached_E, cached_keys = cached
+                self.MST_result = UndirectedGraph(V=self.source_G.V, E=cached_E, keys=tuple(cached_keys))
+                return
+
         if method == self.METHOD_PRIMS:
             self.find_MST_by_Prims()
         if method == self.METHOD_KRUSKAL:
             self.find_MST_by_Kruskals()
 
+        if cache_key is not None and self.MST_result is not None:
+            self.cache.put(cache_key, (self.MST_result.E, self.MST_result.additional_keys))
+
     def find_MST_by_Prims(self) -> None:
         """
             uses Prim's algorithm to generate self.MST_result, an undirected graph that consists of the same vertices as
@@ -33,7 +48,7 @@ class MST:
         """
         # initialize the result, copying the vertices, but leaving the edges dictionary empty. (This edges dictionary is
         #        "X" in the video.)
-        self.MST_result = UndirectedGraph(V=self.source_G.V, E={})
+        self.MST_result = self.source_G.subgraph_view()
         num_Nodes: int = len(self.source_G.V)
 
         # initialize the set of vertices, S, with a random choice.
@@ -75,7 +90,7 @@ class MST:
         """
         # initialize the result, copying the vertices, but leaving the edges dictionary empty. (This edges dictionary is
         #        "X" in the video.)
-        self.MST_result: UndirectedGraph = UndirectedGraph(V=self.source_G.V, E={})
+        self.MST_result: UndirectedGraph = self.source_G.subgraph_view()
 
         # initialize the disjoint set.
         self.disjoint_set.clear()
@@ -142,8 +157,14 @@ class MST:
         return self.MST_result.draw_self(window=window, origin=origin, caption=caption, color=color)
 
     def update_window(self, caption: str):
-        window: np.ndarray = self.source_G.draw_self(caption="Original")
-        window = self.draw_self(caption=caption, window=window, origin=(400, 0), color=(1.0, 0.75, 0.25))
+        import cv2
+        from IncrementalRendererFile import IncrementalRenderer
+
+        if self.renderer is None:
+            self.renderer = IncrementalRenderer()
+        self.renderer.draw_panel("Original", self.source_G, caption="Original")
+        window: np.ndarray = self.renderer.draw_panel("Result", self.MST_result, caption=caption, origin=(400, 0),
+                                                      color=(1.0, 0.75, 0.25))
         print("With drawing window holding focus, press any button to proceed.")
         cv2.imshow("MST", window)
         cv2.waitKey()
@@ -1,44 +1,88 @@
 import copy
+import heapq
+import math
 import random
+from collections import deque
 
 import numpy as np
-import cv2
 import time
-from typing import List, Optional
+from typing import List, Optional, Dict, Set
 from TypesAndConstants import *
 from DirectedGraphFile import DirectedGraph
+from SolutionCacheFile import SolutionCache
 
 
 class MaxFlowMinCutSolver:
-    def find_max_flow(self, capacity: DirectedGraph, capacity_key: str = KEY_CAPACITY) -> Tuple[DirectedGraph,
-                                                                                              DirectedGraph]:
+    # ways of choosing the next augmenting path in find_max_flow(). F is the value of the max flow, U the largest
+    # capacity, and V, E the numbers of vertices and edges.
+    STRATEGY_DFS = 0  # whatever find_nonzero_path_in_graph() finds. Up to F augmentations.
+    STRATEGY_SHORTEST = 1  # fewest edges, by BFS (Edmonds-Karp). At most V*E/2 augmentations, whatever the capacities.
+    STRATEGY_WIDEST = 2  # largest bottleneck, by a max-bottleneck Dijkstra. O(E log F) augmentations.
+    STRATEGY_SCALING = 3  # any path with every edge >= delta, halving delta as they run out. O(E log U) augmentations.
+    STRATEGY_AUTO = 4  # pick one of the above, by comparing V with log U - see choose_strategy().
+
+    def __init__(self, cache: SolutionCache = None) -> None:
+        """
+        :param cache: an optional SolutionCache; if given, find_max_flow() and find_reachable_vertices() will return a
+                      stored result when they are handed a graph they (or another solver sharing the cache) have
+                      already solved.
+        """
+        self.cache: Optional[SolutionCache] = cache
+        self.renderer = None  # an IncrementalRenderer that keeps the display between display_graphs() calls, made
+        #                       (along with loading OpenCV) the first time it is needed.
+
+    def find_max_flow(self,
+                      capacity: DirectedGraph,
+                      capacity_key: str = KEY_CAPACITY,
+                      strategy: int = STRATEGY_DFS) -> Tuple[DirectedGraph, DirectedGraph]:
         """
         finds the maximum flow from "S" to "T" for the given graph -
         :param capacity: The directed graph in which to perform the search - it should contain a vertex labeled "S" and
                          one labeled "T".
         :param capacity_key: the key used to ask each edge for the capacity of this connection
+        :param strategy: how to choose each augmenting path - one of the STRATEGY_... constants.
         :return: flow - a parallel graph to capacity, with the same vertices, and edges labeled by KEY_FLOW with the
                             amount of flow through that edge
                  residual - a similar graph to capacity, with the same vertices, and edges laid out parallel and
                              anti-parallel to the original. The residual is what is used to calculate the max flow,
                              and it is included in the output to be used for finding the min cut.
         """
+        cache_key: Optional[str] = None
+        if self.cache is not None:
+            # generate_residual() reads KEY_CAPACITY, whatever capacity_key is, so the hash needs both.
+            cache_key = self.cache.make_key(capacity, "find_max_flow", capacity_key, strategy,
+                                            keys=(capacity_key, KEY_CAPACITY))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                flow_E, flow_keys, residual_E, residual_keys = cached
+                return (DirectedGraph(capacity.V, flow_E, keys=tuple(flow_keys)),
+                        DirectedGraph(capacity.V, residual_E, keys=tuple(residual_keys)))
+
         # --> We'll start by initializing KEY_FLOW.....
-        flow: DirectedGraph = DirectedGraph(capacity.V, {})  # make a flow be a copy of the capacity's vertices,
-        # with no edges.
+        # make a flow share the capacity's vertices, with no edges. It's directed, even if the capacity isn't.
+        flow: DirectedGraph = capacity.subgraph_view(view_class=DirectedGraph)
         # add edges with KEY_FLOW = 0 that otherwise match the edges in capacity.
         for e_id in capacity.E:
             flow.add_edge(u_id=capacity.E[e_id][KEY_U],
                           v_id=capacity.E[e_id][KEY_V],
                           additional_info={KEY_FLOW: 0})
 
+        if strategy == self.STRATEGY_AUTO:
+            strategy = self.choose_strategy(capacity, capacity_key)
+        delta: int = 1  # for STRATEGY_SCALING: the largest power of two that is no bigger than the largest capacity.
+        if strategy == self.STRATEGY_SCALING:
+            largest: int = max((int(e[capacity_key]) for e in capacity.E.values()), default=1)
+            delta = 1 << max(0, largest.bit_length() - 1)
 
         while True:
             # --> Generate the residual graph.
             residual: DirectedGraph = self.generate_residual(capacity, flow)
 
             # --> Find a path from S to T
-            path: List[int] = self.find_nonzero_path_in_graph(residual)
+            path: List[int] = self.find_augmenting_path(residual, strategy, delta)
+            while path is None and strategy == self.STRATEGY_SCALING and delta > 1:
+                delta //= 2  # there are no more paths this wide, so settle for narrower ones.
+                path = self.find_augmenting_path(residual, strategy, delta)
             # path should be in the format of a list of Vertex ids....
 
             # --> GRAPHICS: build a graph with just the vertices and only those edges in the path
@@ -56,6 +100,8 @@ class MaxFlowMinCutSolver:
 
             # adjust the flow graph, based on this minimum value you just found.
 
+        if cache_key is not None:
+            self.cache.put(cache_key, (flow.E, flow.additional_keys, residual.E, residual.additional_keys))
         return flow, residual
 
     @staticmethod
@@ -66,8 +112,8 @@ class MaxFlowMinCutSolver:
         :param flow:
         :return:
         """
-        residual: DirectedGraph = DirectedGraph(capacity.V, {})  # create a new graph with the same vertices, but no
-        #                                                          edges.
+        # create a new (directed) graph with the same vertices, but no edges.
+        residual: DirectedGraph = capacity.subgraph_view(view_class=DirectedGraph)
         for e_id in capacity.E:  # loop through all the edges in capacity graph...
 
             # try to find the corresponding edge in flow graph...
@@ -102,13 +148,125 @@ class MaxFlowMinCutSolver:
         :param path: a list of vertex ids.
         :return: a new graph, as described.
         """
-        path_display: DirectedGraph = DirectedGraph(capacity.V, {})
+        path_display: DirectedGraph = capacity.subgraph_view(view_class=DirectedGraph)
         if path is not None:
             for i in range(len(path) - 1):
                 path_display.add_edge(path[i], path[i + 1], {})
 
         return path_display
 
+    def choose_strategy(self, capacity: DirectedGraph, capacity_key: str = KEY_CAPACITY) -> int:
+        """
+        picks a path strategy for STRATEGY_AUTO, by comparing the bounds on the number of augmentations given above:
+        V*E/2 for Edmonds-Karp and about 2E*log2(U) for capacity scaling. The first is no larger when V <= 4*log2(U),
+        and then each of its searches is also a plain BFS; otherwise, scaling wins.
+        :param capacity: the graph to be solved
+        :param capacity_key: the key used to ask each edge for the capacity of this connection
+        :return: STRATEGY_SHORTEST or STRATEGY_SCALING
+        """
+        largest: int = max((int(e[capacity_key]) for e in capacity.E.values()), default=0)
+        if largest <= 1 or len(capacity.V) <= 4 * math.log2(largest):
+            return self.STRATEGY_SHORTEST
+        return self.STRATEGY_SCALING
+
+    def find_augmenting_path(self, residual: DirectedGraph, strategy: int, delta: int = 1) -> Optional[List[int]]:
+        """
+        finds the next path from "S" to "T" in the residual graph, in the way given by strategy.
+        :param residual: the residual graph in which to search
+        :param strategy: one of the STRATEGY_... constants (other than STRATEGY_AUTO).
+        :param delta: for STRATEGY_SCALING, the smallest residual capacity an edge may have to be used.
+        :return: a list of vertex ids from S to T (inclusive), or None if there is no such path.
+        """
+        if strategy == self.STRATEGY_SHORTEST:
+            return self.find_shortest_path_in_graph(residual)
+        if strategy == self.STRATEGY_WIDEST:
+            return self.find_widest_path_in_graph(residual)
+        if strategy == self.STRATEGY_SCALING:
+            return self.find_shortest_path_in_graph(residual, minimum=delta)
+        return self.find_nonzero_path_in_graph(residual)
+
+    @staticmethod
+    def find_shortest_path_in_graph(graph: DirectedGraph,
+                                    start_label: str = "S",
+                                    end_label: str = "T",
+                                    key: str = KEY_CAPACITY,
+                                    minimum: int = 1) -> Optional[List[int]]:
+        """
+        Uses a breadth-first search (BFS) to find the path with the fewest edges from the start label to the end label,
+        using only edges whose value for "key" is at least "minimum".
+        :param graph: the DirectedGraph in which to search
+        :param start_label: the label of the node to start at
+        :param end_label: the label of the node to end at
+        :param key: what parameter of the edges are we checking?
+        :param minimum: the smallest value of "key" that an edge may have and still be used.
+        :return: a list of id's for the vertices in the graph that compose a path from start_id to end_id (inclusive),
+                 in order... or None, if no such path exists.
+        """
+        s_id: int = graph.get_id_for_vertex_with_label(start_label)
+        t_id: int = graph.get_id_for_vertex_with_label(end_label)
+        previous: Dict[int, int] = {s_id: -1}
+        frontier: deque = deque([s_id])
+        while len(frontier) > 0:
+            u_id: int = frontier.popleft()
+            if u_id == t_id:
+                return MaxFlowMinCutSolver.trace_path(previous, t_id)
+            for edge in graph.get_edges_from_u(u_id):
+                if edge[key] >= minimum and edge[KEY_V] not in previous:
+                    previous[edge[KEY_V]] = u_id
+                    frontier.append(edge[KEY_V])
+        return None
+
+    @staticmethod
+    def find_widest_path_in_graph(graph: DirectedGraph,
+                                  start_label: str = "S",
+                                  end_label: str = "T",
+                                  key: str = KEY_CAPACITY) -> Optional[List[int]]:
+        """
+        Uses a max-bottleneck version of Dijkstra's algorithm to find the path from the start label to the end label
+        whose smallest value of "key" is as large as possible.
+        :param graph: the DirectedGraph in which to search
+        :param start_label: the label of the node to start at
+        :param end_label: the label of the node to end at
+        :param key: what parameter of the edges are we checking?
+        :return: a list of id's for the vertices in the graph that compose a path from start_id to end_id (inclusive),
+                 in order... or None, if no path with a non-zero bottleneck exists.
+        """
+        s_id: int = graph.get_id_for_vertex_with_label(start_label)
+        t_id: int = graph.get_id_for_vertex_with_label(end_label)
+        previous: Dict[int, int] = {s_id: -1}
+        best_width: Dict[int, float] = {s_id: float("inf")}
+        finished: Set[int] = set()
+        hq: List[Tuple[float, int]] = [(-best_width[s_id], s_id)]  # [-width, vertex_id], so the widest comes first.
+        while len(hq) > 0:
+            negative_width, u_id = heapq.heappop(hq)
+            if u_id in finished:
+                continue
+            if u_id == t_id:
+                return MaxFlowMinCutSolver.trace_path(previous, t_id)
+            finished.add(u_id)
+            for edge in graph.get_edges_from_u(u_id):
+                width: float = min(-negative_width, edge[key])
+                v_id: int = edge[KEY_V]
+                if width > 0 and v_id not in finished and width > best_width.get(v_id, 0):
+                    best_width[v_id] = width
+                    previous[v_id] = u_id
+                    heapq.heappush(hq, (-width, v_id))
+        return None
+
+    @staticmethod
+    def trace_path(previous: Dict[int, int], end_id: int) -> List[int]:
+        """
+        follows a "previous" dictionary, as built by a search, back from the end to the start.
+        :param previous: {vertex_id: id of the vertex we reached it from}, with -1 for the start vertex.
+        :param end_id: the vertex at which the path ends
+        :return: the list of vertex ids from the start to end_id, inclusive.
+        """
+        path: List[int] = [end_id]
+        while previous[path[-1]] != -1:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path
+
     @staticmethod
     def find_nonzero_path_in_graph(graph: DirectedGraph,
                                    start_label: str = "S",
@@ -133,25 +291,34 @@ class MaxFlowMinCutSolver:
         #  "random.shuffle(name_of_list)"
 
 
-    @staticmethod
-    def display_graphs(capacity: DirectedGraph,
+    def display_graphs(self,
+                       capacity: DirectedGraph,
                        flow: DirectedGraph,
                        residual: DirectedGraph,
                        path_display: DirectedGraph = None) -> np.ndarray:
         """
-        Draws the graphs in one window and waits for the user to press a key
+        Draws the graphs in one window and waits for the user to press a key. Each graph is its own panel of
+        self.renderer, so after the first call only the edges that have changed since the last one are redrawn.
         :param capacity:
         :param flow:
         :param residual:
         :param path_display:
         :return: the numpy array (shape: h x w x 3, dtype = float) that was drawn.
         """
+        import cv2
+        from IncrementalRendererFile import IncrementalRenderer
+
         start_time: float = time.time()
-        window: np.ndarray = capacity.draw_self(origin=(0, 0), caption=KEY_CAPACITY, color=(0.75, 1.0, 0.25))
-        window = flow.draw_self(origin=(400, 0), caption=KEY_FLOW, window=window, color=(0.75, 1.0, 0.25))
-        window = residual.draw_self(origin=(0, 400), caption="Residual", window=window, color=(0.75, 1.0, 0.25))
+        if self.renderer is None:
+            self.renderer = IncrementalRenderer()
+        self.renderer.draw_panel(KEY_CAPACITY, capacity, origin=(0, 0), caption=KEY_CAPACITY, color=(0.75, 1.0, 0.25))
+        self.renderer.draw_panel(KEY_FLOW, flow, origin=(400, 0), caption=KEY_FLOW, color=(0.75, 1.0, 0.25))
+        self.renderer.draw_panel("Residual", residual, origin=(0, 400), caption="Residual", color=(0.75, 1.0, 0.25))
         if path_display is not None:
-            window = path_display.draw_self(origin=(400, 400), caption="Path", window=window, color=(0.75, 1.0, 0.25))
+            self.renderer.draw_panel("Path", path_display, origin=(400, 400), caption="Path", color=(0.75, 1.0, 0.25))
+        else:
+            self.renderer.clear_panel("Path", origin=(400, 400))
+        window: np.ndarray = self.renderer.window
         cv2.imshow("Graphs", window)
         print(f"Time to Display: {time.time()-start_time}")
         print("With focus in the graphics window, press a key to continue.")
@@ -168,6 +335,13 @@ class MaxFlowMinCutSolver:
         :param start_node_label:  the letter we wish to use as the starting point, most likely "S".
         :return: list of vertex id's that can be reached by a walk from the start node.
         """
+        cache_key: Optional[str] = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(residual, "find_reachable_vertices", start_node_label, keys=(KEY_CAPACITY,))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         s_id: int = residual.get_id_for_vertex_with_label(start_node_label)
         result: List[int] = [s_id]
         frontier: List[int] = [s_id]
@@ -175,4 +349,6 @@ class MaxFlowMinCutSolver:
         #  frontier. (This is the part at the end that makes the Cut... not the pathfinding to build the flow and
         #  residual.)
 
+        if cache_key is not None:
+            self.cache.put(cache_key, result)
         return result
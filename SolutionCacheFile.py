@@ -0,0 +1,140 @@
+import copy
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from TypesAndConstants import *
+from DirectedGraphFile import DirectedGraph
+
+
+class SolutionCache:
+    """
+    An in-memory, least-recently-used cache of solver results, keyed by a canonical hash of the graph that was solved
+    (plus whatever else the caller says distinguishes one solve from another, e.g., the method or the start label.)
+    If a directory is given, entries are also pickled there, so that they survive between runs and can be shared by
+    several worker processes.
+    """
+
+    def __init__(self, max_entries: int = 128, directory: str = None) -> None:
+        self.max_entries: int = max_entries
+        self.directory: Optional[str] = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.entries: OrderedDict[str, Any] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @staticmethod
+    def hash_graph(graph: DirectedGraph, keys: Tuple[str, ...] = (KEY_CAPACITY, KEY_WEIGHT)) -> str:
+        """
+        builds a canonical hash of the structure and attributes of the given graph: the vertex ids and labels, and the
+        u, v and the values for each of "keys" of every edge. Edges are sorted by id and vertices by id, so two graphs
+        that were loaded from the same file will hash the same, no matter what order their dictionaries were filled in.
+        Each column is gathered with one bulk conversion to a numpy array and hashed as a single buffer.
+        :param graph: the graph to hash
+        :param keys: the edge attributes to include - these should be all the ones the solve being cached reads.
+        :return: a hex digest identifying this graph.
+        """
+        hasher = hashlib.sha256()
+        hasher.update(b"directed" if graph.i_am_directed else b"undirected")
+
+        v_ids: np.ndarray = np.fromiter(graph.V.keys(), dtype=np.int64, count=len(graph.V))
+        v_order: np.ndarray = np.argsort(v_ids, kind="stable")
+        labels: list = list(graph.V.values())
+        hasher.update(v_ids[v_order].tobytes())
+        hasher.update("\t".join(str(labels[i][KEY_LABEL]) for i in v_order).encode("utf-8"))
+
+        num_edges: int = len(graph.E)
+        e_ids: np.ndarray = np.fromiter(graph.E.keys(), dtype=np.int64, count=num_edges)
+        e_order: np.ndarray = np.argsort(e_ids, kind="stable")
+        edges: list = list(graph.E.values())
+        hasher.update(e_ids[e_order].tobytes())
+        for key in (KEY_U, KEY_V):
+            hasher.update(np.fromiter((e[key] for e in edges), dtype=np.int64, count=num_edges)[e_order].tobytes())
+        for key in dict.fromkeys(keys):
+            # which edges have this key at all, so that a missing weight doesn't collide with any real weight.
+            present: np.ndarray = np.fromiter((key in e for e in edges), dtype=bool, count=num_edges)
+            column: np.ndarray = np.array([e.get(key, 0) for e in edges]).reshape(num_edges)
+            hasher.update(f"{key}:{column.dtype.str}".encode("utf-8"))  # so 2 and 2.0, or two keys, don't collide.
+            hasher.update(present[e_order].tobytes())
+            if column.dtype == object:  # not numbers, so there's no buffer to hash.
+                hasher.update(repr(column[e_order].tolist()).encode("utf-8"))
+            else:
+                hasher.update(column[e_order].tobytes())
+        return hasher.hexdigest()
+
+    def make_key(self,
+                 graph: DirectedGraph,
+                 *qualifiers: Any,
+                 keys: Tuple[str, ...] = (KEY_CAPACITY, KEY_WEIGHT)) -> str:
+        """
+        combines the hash of the graph with any other values that distinguish one request from another.
+        :param graph: the graph being solved
+        :param qualifiers: e.g., the method used, the start label, the capacity key...
+        :param keys: the edge attributes the solve reads; see hash_graph().
+        :return: a key for get()/put().
+        """
+        key: str = self.hash_graph(graph, keys)
+        if len(qualifiers) > 0:
+            key = f"{key}-{hashlib.sha256(repr(qualifiers).encode('utf-8')).hexdigest()[:16]}"
+        return key
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        looks up a result, first in memory and then (if there is one) in the cache directory.
+        :param key: a key from make_key()
+        :return: a private copy of the cached result, or None if there isn't one.
+        """
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self.entries[key])
+        if self.directory is not None:
+            path: str = self._path_for(key)
+            if os.path.exists(path):
+                with open(path, "rb") as file:
+                    value = pickle.load(file)
+                self._remember(key, value)
+                self.hits += 1
+                return copy.deepcopy(value)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        stores a (copy of a) result in memory and, if there is one, in the cache directory.
+        :param key: a key from make_key()
+        :param value: the result to store - anything that can be pickled.
+        :return: None
+        """
+        value = copy.deepcopy(value)
+        self._remember(key, value)
+        if self.directory is not None:
+            temp_path: str = f"{self._path_for(key)}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._path_for(key))  # so another process never reads a half-written file.
+
+    def clear(self) -> None:
+        """
+        empties the in-memory cache. (Anything on disk is left alone.)
+        :return: None
+        """
+        self.entries.clear()
+
+    def _remember(self, key: str, value: Any) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)  # evict the least recently used.
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
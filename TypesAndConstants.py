@@ -1,4 +1,6 @@
-from typing import TypedDict, Tuple, Final
+import operator
+from collections.abc import Mapping, MutableMapping
+from typing import Tuple, Final, FrozenSet, Iterator, Any, Callable
 KEY_LABEL: Final[str] = "label"
 KEY_LOCATION: Final[str] = "location"
 KEY_COLOR: Final[str] = "color"
@@ -8,17 +10,150 @@ KEY_CAPACITY: Final[str] = "capacity"
 KEY_WEIGHT: Final[str] = "weight"
 KEY_FLOW: Final[str] = "flow"
 
-class Vertex(TypedDict, total=False):
-    KEY_LABEL: str
-    KEY_LOCATION: Tuple[int, int]
-    KEY_COLOR: Tuple[float, float, float]
 
+class _Missing:
+    """
+    The type of _MISSING, what a Record's slot holds while that key isn't set. There is only ever one, so that copying
+    or pickling a record (which copies its slots) still gives back _MISSING itself.
+    """
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        return "_MISSING"  # i.e., "the module-level _MISSING", for pickle, copy and deepcopy.
+
+    def __repr__(self) -> str:
+        return "_MISSING"
+
+
+_MISSING: Final[_Missing] = _Missing()
+
+
+class Record(MutableMapping):
+    """
+    A compact stand-in for a dictionary, for the many small records (vertices and edges) that make up a graph. The
+    common keys are stored in __slots__, so a record costs a fraction of the memory of a dict with the same contents;
+    any other key is kept in a small dictionary that is only created if one is used. You still read and write these
+    with record[KEY_...], just as with a dict.
+    Every slot is filled in when the record is made (unset keys hold _MISSING), so that checking for a key never has
+    to raise and catch an AttributeError, and reading one is a single getattr(). (This means a key can't have the same
+    name as one of a record's methods, like "keys" or "get".)
+    """
+    __slots__ = ("_extra",)
+    FIELDS: FrozenSet[str] = frozenset()
+    _get_fields: Callable[["Record"], tuple] = staticmethod(lambda record: ())
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._get_fields = operator.attrgetter(*cls.__slots__)  # all the slots at once, as a tuple, in C.
+
+    def __init__(self, **values: Any) -> None:
+        self._extra = None
+        for key in self.__slots__:
+            setattr(self, key, values.pop(key, _MISSING))
+        if len(values) > 0:
+            self._extra = {}
+            for key in values:
+                self[key] = values[key]
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            value = getattr(self, key)
+        except (AttributeError, TypeError):  # not a slot, so it's either in _extra or not here at all.
+            if self._extra is not None and key in self._extra:
+                return self._extra[key]
+            raise KeyError(key) from None
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Mapping's get() would go through __getitem__ and catch the KeyError; this is one plain lookup.
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        elif isinstance(key, str) and hasattr(type(self), key):
+            raise KeyError(f"{key!r} is the name of an attribute of {type(self).__name__}, so it can't be a key.")
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self.FIELDS and getattr(self, key) is not _MISSING:
+            setattr(self, key, _MISSING)
+        elif key not in self.FIELDS and self._extra is not None and key in self._extra:
+            del self._extra[key]
+            if len(self._extra) == 0:
+                self._extra = None  # so that __eq__ can compare _extra directly.
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self.FIELDS:
+            return getattr(self, key) is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key, value in zip(self.__slots__, self._get_fields(self)):
+            if value is not _MISSING:
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return (sum(1 for value in self._get_fields(self) if value is not _MISSING) +
+                (len(self._extra) if self._extra is not None else 0))
+
+    def __eq__(self, other: object) -> bool:
+        # Mapping's __eq__ would build two dicts for every comparison; records of the same type just compare slots.
+        if self is other:
+            return True
+        if type(other) is type(self):
+            return self._get_fields(self) == other._get_fields(other) and self._extra == other._extra
+        if isinstance(other, Mapping):
+            return self.as_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None  # mutable, like a dict.
+
+    def as_dict(self) -> dict:
+        """
+        :return: a plain dictionary with the same contents as this record.
+        """
+        result: dict = {key: value for key, value in zip(self.__slots__, self._get_fields(self))
+                        if value is not _MISSING}
+        if self._extra is not None:
+            result.update(self._extra)
+        return result
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()})"
+
+
+class Vertex(Record):
+    __slots__ = (KEY_LABEL, KEY_LOCATION, KEY_COLOR)
+    FIELDS: FrozenSet[str] = frozenset(__slots__)
+
+    label: str
+    location: Tuple[int, int]
+    color: Tuple[float, float, float]
+
+
+class Edge(Record):  # not every field needs to be filled in; you can still have an edge if these aren't.
+    __slots__ = (KEY_U, KEY_V, KEY_CAPACITY, KEY_WEIGHT, KEY_FLOW)
+    FIELDS: FrozenSet[str] = frozenset(__slots__)
 
-class Edge(TypedDict, total=False):  # total = False means that you can still have an edge if these aren't filled in.
     u: int
     v: int
     capacity: int
     weight: int
     flow: int
 
-    # add more, as needed.
+    # other keys are allowed, and are stored in _extra.
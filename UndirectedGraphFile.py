@@ -1,9 +1,10 @@
 from DirectedGraphFile import DirectedGraph
-from typing import Dict, List
+from typing import Dict, List, Iterable
 from TypesAndConstants import *
 
 
 class UndirectedGraph(DirectedGraph):
+    DIRECTED = False
 
     def __init__(self,
                  V: Dict[int, Vertex] = None,
@@ -16,6 +17,12 @@ class UndirectedGraph(DirectedGraph):
         self.edge_table = self.u_edge_table
         self.edge_tables_dirty = True
 
+    def init_as_view_of(self, parent: DirectedGraph, edge_ids: Iterable[int], keys: Tuple[str]) -> None:
+        """ overrides directed version, to set up the undirected fields as __init__ would. """
+        super().init_as_view_of(parent, edge_ids, keys)
+        self.i_am_directed = False
+        self.EDGE_OFFSET = 0
+        self.edge_table = self.u_edge_table
 
     def generate_edge_tables(self) -> None:
         self.edge_table: Dict[int, List[int]] = {}
@@ -0,0 +1,272 @@
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+from TypesAndConstants import *
+from DirectedGraphFile import DirectedGraph
+
+
+class Viewport:
+    """
+    A rectangle of pixels looking at part of a graph: (x, y) is the graph location shown at the top-left corner, and
+    zoom is the number of pixels drawn per unit of graph location.
+    """
+
+    def __init__(self, x: float = 0, y: float = 0, width: int = 800, height: int = 800, zoom: float = 1.0) -> None:
+        self.x: float = x
+        self.y: float = y
+        self.width: int = width
+        self.height: int = height
+        self.zoom: float = zoom
+
+    def pan(self, dx_pixels: float, dy_pixels: float) -> None:
+        """
+        moves the viewport by the given number of pixels.
+        :param dx_pixels: how far to move right
+        :param dy_pixels: how far to move down
+        :return: None
+        """
+        self.x += dx_pixels / self.zoom
+        self.y += dy_pixels / self.zoom
+
+    def zoom_about(self, factor: float, pixel: Tuple[float, float] = None) -> None:
+        """
+        zooms in (factor > 1) or out (factor < 1), keeping the graph location under the given pixel where it is.
+        :param factor: how much to multiply the zoom by
+        :param pixel: the (x, y) pixel to zoom about; None means the center of the viewport.
+        :return: None
+        """
+        if pixel is None:
+            pixel = (self.width / 2, self.height / 2)
+        self.x += pixel[0] / self.zoom - pixel[0] / (self.zoom * factor)
+        self.y += pixel[1] / self.zoom - pixel[1] / (self.zoom * factor)
+        self.zoom *= factor
+
+    def graph_bounds(self, margin_pixels: float = 0) -> Tuple[float, float, float, float]:
+        """
+        :param margin_pixels: how much extra space to include around the edge of the viewport
+        :return: (left, top, right, bottom) of the part of the graph this viewport can see, in graph locations.
+        """
+        margin: float = margin_pixels / self.zoom
+        return (self.x - margin, self.y - margin,
+                self.x + self.width / self.zoom + margin, self.y + self.height / self.zoom + margin)
+
+
+class SpatialGrid:
+    """
+    A uniform grid over the locations in a graph, so that the vertices and edges that fall within a rectangle can be
+    found without looking at all of them. Each vertex is filed under the cell that holds its location; each edge under
+    every cell that its bounding box touches - unless that would be more than LONG_EDGE_CELLS cells, in which case the
+    edge is kept in a list of long edges whose bounding boxes are checked all at once, with numpy.
+    """
+    LONG_EDGE_CELLS: int = 16
+
+    def __init__(self, graph: DirectedGraph, cell_size: float = None) -> None:
+        """
+        :param graph: the graph to index. (If the graph changes, build a new grid.)
+        :param cell_size: the width and height of each cell, in graph locations. None picks one so that there are
+                          roughly as many cells as vertices.
+        """
+        self.graph: DirectedGraph = graph
+        locations: np.ndarray = np.array([v[KEY_LOCATION] for v in graph.V.values()], dtype=float).reshape(-1, 2)
+        if cell_size is None:
+            extent: float = float(np.ptp(locations, axis=0).max()) if len(locations) > 0 else 0.0
+            cell_size = max(extent / max(1.0, math.sqrt(len(locations))), 1.0)
+        self.cell_size: float = cell_size
+        self.vertex_cells: Dict[Tuple[int, int], List[int]] = {}
+        self.edge_cells: Dict[Tuple[int, int], List[int]] = {}
+        long_edge_ids: List[int] = []
+        long_edge_bounds: List[Tuple[float, float, float, float]] = []
+
+        for v_id, (x, y) in zip(graph.V, locations):
+            self.vertex_cells.setdefault(self.cell_for(x, y), []).append(v_id)
+        for e_id in graph.E:
+            e: Edge = graph.E[e_id]
+            u_x, u_y = graph.V[e[KEY_U]][KEY_LOCATION]
+            v_x, v_y = graph.V[e[KEY_V]][KEY_LOCATION]
+            edge_bounds = (min(u_x, v_x), min(u_y, v_y), max(u_x, v_x), max(u_y, v_y))
+            first_column, first_row = self.cell_for(edge_bounds[0], edge_bounds[1])
+            last_column, last_row = self.cell_for(edge_bounds[2], edge_bounds[3])
+            if (last_column - first_column + 1) * (last_row - first_row + 1) > self.LONG_EDGE_CELLS:
+                long_edge_ids.append(e_id)
+                long_edge_bounds.append(edge_bounds)
+                continue
+            for cell in self.cells_overlapping(*edge_bounds):
+                self.edge_cells.setdefault(cell, []).append(e_id)
+        self.long_edge_ids: np.ndarray = np.array(long_edge_ids, dtype=np.int64)
+        self.long_edge_bounds: np.ndarray = np.array(long_edge_bounds, dtype=float).reshape(-1, 4)
+
+    def cell_for(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def cells_overlapping(self, left: float, top: float, right: float, bottom: float) -> List[Tuple[int, int]]:
+        """
+        :return: the (column, row) of every cell that overlaps the given rectangle of graph locations.
+        """
+        first_column, first_row = self.cell_for(left, top)
+        last_column, last_row = self.cell_for(right, bottom)
+        return [(column, row) for column in range(first_column, last_column + 1)
+                for row in range(first_row, last_row + 1)]
+
+    def vertices_in(self, bounds: Tuple[float, float, float, float]) -> Set[int]:
+        """
+        :param bounds: (left, top, right, bottom), in graph locations
+        :return: the ids of the vertices whose cells overlap the bounds (which may include a few just outside.)
+        """
+        found: Set[int] = set()
+        for cell in self._occupied_cells_in(bounds, self.vertex_cells):
+            found.update(self.vertex_cells[cell])
+        return found
+
+    def edges_in(self, bounds: Tuple[float, float, float, float]) -> Set[int]:
+        """
+        :param bounds: (left, top, right, bottom), in graph locations
+        :return: the ids of the edges whose bounding boxes share a cell with the bounds.
+        """
+        found: Set[int] = set()
+        for cell in self._occupied_cells_in(bounds, self.edge_cells):
+            found.update(self.edge_cells[cell])
+        left, top, right, bottom = self.long_edge_bounds.T
+        overlapping: np.ndarray = ((left <= bounds[2]) & (right >= bounds[0]) &
+                                   (top <= bounds[3]) & (bottom >= bounds[1]))
+        found.update(self.long_edge_ids[overlapping].tolist())
+        return found
+
+    def _occupied_cells_in(self,
+                           bounds: Tuple[float, float, float, float],
+                           cells: Dict[Tuple[int, int], List[int]]) -> List[Tuple[int, int]]:
+        # when zoomed far out, the bounds can cover many more cells than are occupied; then just check the occupied.
+        first_column, first_row = self.cell_for(bounds[0], bounds[1])
+        last_column, last_row = self.cell_for(bounds[2], bounds[3])
+        if (last_column - first_column + 1) * (last_row - first_row + 1) > len(cells):
+            return [cell for cell in cells
+                    if first_column <= cell[0] <= last_column and first_row <= cell[1] <= last_row]
+        return [cell for cell in self.cells_overlapping(*bounds) if cell in cells]
+
+
+class ViewportRenderer:
+    """
+    Draws a graph through a Viewport of any size, drawing only the edges and vertices that can be seen in it. It can
+    also draw a canvas far bigger than fits in memory, one tile at a time, in parallel.
+    """
+    # how far outside the viewport something may be and still be partly visible - the vertex radius, plus room for the
+    # edge labels.
+    MARGIN_PIXELS: int = 60
+
+    def __init__(self, graph: DirectedGraph, cell_size: float = None) -> None:
+        self.graph: DirectedGraph = graph
+        self.grid: SpatialGrid = SpatialGrid(graph, cell_size)
+
+    def render(self,
+               viewport: Viewport,
+               window: np.ndarray = None,
+               caption: str = None,
+               color: Tuple[float, float, float] = None,
+               cut_color: Tuple[float, float, float] = (1.0, 0.5, 0.85)) -> np.ndarray:
+        """
+        draws the part of the graph that the viewport can see.
+        :param viewport: what part of the graph to draw, and how large
+        :param window: the (viewport.height x viewport.width x 3) array to draw in, or None for a new float32 one.
+        :param caption: An optional piece of text to draw at the top-left corner.
+        :param color: A BGR tuple [0.0-1.0) for the standard color of the edges, or None to give each edge a random
+                      color chosen by its id - the same one in every viewport and tile.
+        :param cut_color: A BGR tuple [0.0-1.0) for the color of edges that are cut.
+        :return: the window in which this was drawn
+        """
+        if window is None:
+            window = np.zeros([viewport.height, viewport.width, 3], dtype=np.float32)
+        origin: Tuple[float, float] = (-viewport.x * viewport.zoom, -viewport.y * viewport.zoom)
+        bounds: Tuple[float, float, float, float] = viewport.graph_bounds(self.MARGIN_PIXELS)
+
+        for e_id in sorted(self.grid.edges_in(bounds)):  # sorted, so edges overlap the same way as in draw_self.
+            if color is None:
+                edge_color = self.color_for_edge(e_id)
+                self.graph.draw_edge(window, self.graph.E[e_id], origin=origin, color=edge_color,
+                                     cut_color=edge_color, scale=viewport.zoom)
+            else:
+                self.graph.draw_edge(window, self.graph.E[e_id], origin=origin, color=color, cut_color=cut_color,
+                                     scale=viewport.zoom)
+        for v_id in sorted(self.grid.vertices_in(bounds)):  # and so do the vertices.
+            self.graph.draw_vertex(window, self.graph.V[v_id], origin=origin, scale=viewport.zoom)
+
+        if caption is not None:
+            cv2.putText(window, caption, (0, 15), cv2.FONT_HERSHEY_PLAIN, 1, (1.0, 1.0, 1.0), 1)
+        return window
+
+    @staticmethod
+    def color_for_edge(e_id: int) -> Tuple[float, float, float]:
+        """
+        :return: a random color for the given edge, in the same range draw_edge() picks from, but always the same for
+                 the same id - so an edge that crosses from one tile into another keeps its color.
+        """
+        rng = random.Random(e_id)
+        return rng.randrange(25, 100) / 100, rng.randrange(25, 100) / 100, rng.randrange(25, 100) / 100
+
+    def render_tiles(self,
+                     canvas_width: int,
+                     canvas_height: int,
+                     directory: str,
+                     tile_size: int = 512,
+                     zoom: float = 1.0,
+                     color: Tuple[float, float, float] = None,
+                     processes: int = None) -> List[str]:
+        """
+        draws a canvas of the given size as a grid of tiles, each saved as "tile_<row>_<column>.png" in the directory.
+        Only one tile per worker is ever held in memory, as 8-bit color once it is done, so the canvas can be much
+        larger than would fit as one float image.
+        :param canvas_width: the width of the whole canvas, in pixels
+        :param canvas_height: the height of the whole canvas, in pixels
+        :param directory: where to save the tiles
+        :param tile_size: the width and height of each tile, in pixels
+        :param zoom: pixels per unit of graph location
+        :param color: A BGR tuple [0.0-1.0) for the standard color of the edges, or None for a color per edge id.
+        :param processes: the number of worker processes to draw in; None means one per CPU, and 1 means draw here.
+        :return: the paths of the tiles, in row-major order.
+        """
+        os.makedirs(directory, exist_ok=True)
+        jobs: List[Tuple[Viewport, str]] = []
+        for top in range(0, canvas_height, tile_size):
+            for left in range(0, canvas_width, tile_size):
+                viewport = Viewport(x=left / zoom, y=top / zoom,
+                                    width=min(tile_size, canvas_width - left),
+                                    height=min(tile_size, canvas_height - top),
+                                    zoom=zoom)
+                path = os.path.join(directory, f"tile_{top // tile_size}_{left // tile_size}.png")
+                jobs.append((viewport, path))
+
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes <= 1 or len(jobs) <= 1:
+            for viewport, path in jobs:
+                self.save_tile(viewport, path, color)
+        else:
+            # each worker gets its own copy of this renderer (graph and grid) once, rather than once per tile.
+            with ProcessPoolExecutor(max_workers=min(processes, len(jobs)),
+                                     initializer=_start_tile_worker, initargs=(self,)) as executor:
+                list(executor.map(_save_tile_in_worker, [job[0] for job in jobs], [job[1] for job in jobs],
+                                  [color] * len(jobs)))
+        return [job[1] for job in jobs]
+
+    def save_tile(self, viewport: Viewport, path: str, color: Tuple[float, float, float] = None) -> None:
+        """
+        draws one tile and saves it, as an 8-bit image, to the given path.
+        """
+        window: np.ndarray = self.render(viewport, color=color)
+        cv2.imwrite(path, np.clip(window * 255, 0, 255).astype(np.uint8))
+
+
+_worker_renderer: Optional[ViewportRenderer] = None
+
+
+def _start_tile_worker(renderer: ViewportRenderer) -> None:
+    global _worker_renderer
+    _worker_renderer = renderer
+
+
+def _save_tile_in_worker(viewport: Viewport, path: str, color: Tuple[float, float, float]) -> None:
+    _worker_renderer.save_tile(viewport, path, color)
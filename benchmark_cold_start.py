@@ -0,0 +1,46 @@
+"""
+Measures how long a fresh python process takes to import what it needs - first just the graphs and solvers (as a batch
+worker would), then the graphs and solvers plus OpenCV (what every worker used to pay, since the solver modules imported
+cv2 at the top.) Each case is run in its own interpreter, several times, and the median is reported.
+
+usage: python benchmark_cold_start.py [number_of_runs]
+"""
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+CASES: Dict[str, str] = {
+    "solvers only": "import MaxFlowMinCutSolverFile, MSTFile, GlobalMinCutFile",
+    "solvers + cv2": "import MaxFlowMinCutSolverFile, MSTFile, GlobalMinCutFile, cv2",
+}
+
+# run inside each child: time the imports, and check whether cv2 came along with them.
+TEMPLATE: str = ("import sys, time\n"
+                 "start = time.perf_counter()\n"
+                 "{imports}\n"
+                 "print(time.perf_counter() - start, 'cv2' in sys.modules)\n")
+
+
+def time_case(imports: str, runs: int) -> List[float]:
+    times: List[float] = []
+    for _ in range(runs):
+        output: str = subprocess.run([sys.executable, "-c", TEMPLATE.format(imports=imports)],
+                                     capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[0]))
+        if not imports.endswith("cv2"):
+            assert output[1] == "False", "Importing the solvers should not import cv2."
+    return times
+
+
+def main():
+    runs: int = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    for name, imports in CASES.items():
+        times = time_case(imports, runs)
+        print(f"{name:>15}: median {statistics.median(times) * 1000:8.1f} ms\t(min {min(times) * 1000:.1f} ms,"
+              f" {runs} runs)")
+
+
+# if this is the file you are telling to run, then call main().
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import copy
+import pickle
+from unittest import TestCase
+import numpy as np
+from DirectedGraphFile import DirectedGraph
+from UndirectedGraphFile import UndirectedGraph
+from GlobalMinCutFile import GlobalMinCutSolver
+from MaxFlowMinCutSolverFile import MaxFlowMinCutSolver
+from TypesAndConstants import *
+
+
+class TestDirectedGraph(TestCase):
+    def test_subgraph_view(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        view = G.subgraph_view([3, 6], keys=(KEY_CAPACITY,))
+        self.assertIs(G.V, view.V, "The view should share the vertices of the graph it came from.")
+        self.assertEqual([3, 6], list(view.E))
+        self.assertIs(G.E[3], view.E[3], "The view should share the edge records, not copy them.")
+        self.assertEqual([G.E[3]], view.get_edges_from_u(1))
+        self.assertEqual([G.E[3]], view.get_edges_to_v(3))
+        self.assertEqual([], view.get_edges_from_u(0))
+        self.assertEqual(6, view.get_edge_id_from_u_to_v(3, 5))
+
+        view.add_edge(0, 5, {KEY_CAPACITY: 1})
+        self.assertEqual(7, view.get_edge_id_from_u_to_v(0, 5), "New edges should not reuse the selected ids.")
+        self.assertEqual(8, len(G.E), "Adding to the view should not add to the original graph.")
+
+    def test_undirected_subgraph_view(self):
+        G = UndirectedGraph(filename="UndirectedGraph2.txt")
+        view = G.subgraph_view([9, 10])
+        self.assertIsInstance(view, UndirectedGraph)
+        self.assertFalse(view.i_am_directed)
+        self.assertEqual([G.E[9], G.E[10]], view.get_edges_touching(3))
+        self.assertEqual([G.E[10]], view.get_edges_to_v(7))
+
+    def test_directed_view_of_undirected_graph(self):
+        G = UndirectedGraph(filename="UndirectedGraph2.txt")
+        view = G.subgraph_view(view_class=DirectedGraph)
+        self.assertIs(type(view), DirectedGraph)
+        self.assertTrue(view.i_am_directed)
+        view.add_edge(0, 2, {KEY_CAPACITY: 1})
+        self.assertEqual([], view.get_edges_from_u(2), "A directed view should only go one way along an edge.")
+
+        solver = MaxFlowMinCutSolver()
+        solver.display_graphs = lambda *graphs: None
+        flow, residual = solver.find_max_flow(UndirectedGraph(filename="DirectedGraph1.txt"))
+        self.assertIs(type(flow), DirectedGraph, "The flow graph should be directed, whatever the capacity is.")
+        self.assertIs(type(residual), DirectedGraph)
+        self.assertIs(type(MaxFlowMinCutSolver.generate_path_display(G, [0, 2])), DirectedGraph)
+
+    def test_compact_records(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        edge = G.E[7]
+        self.assertIsInstance(edge, Edge)
+        self.assertIsInstance(G.V[0], Vertex)
+        self.assertEqual({KEY_U: 4, KEY_V: 5, KEY_CAPACITY: 7}, edge,
+                         "Records should compare equal to a matching dict.")
+        self.assertNotIn(KEY_FLOW, edge)
+        with self.assertRaises(KeyError):
+            _ = edge[KEY_FLOW]
+
+        edge[KEY_FLOW] = 2
+        edge["cost"] = 9  # keys that aren't slots still work.
+        self.assertEqual([KEY_U, KEY_V, KEY_CAPACITY, KEY_FLOW, "cost"], list(edge))
+        self.assertEqual(9, edge["cost"])
+        self.assertFalse(hasattr(edge, "__dict__"), "Records should not carry a per-instance dictionary.")
+
+    def test_record_equality_and_removal(self):
+        edge = Edge(u=1, v=2, capacity=3)
+        self.assertEqual(Edge(u=1, v=2, capacity=3), edge)
+        self.assertNotEqual(Edge(u=1, v=2, capacity=4), edge)
+        self.assertNotEqual(Edge(u=1, v=2, capacity=3, flow=0), edge, "A set key should not equal an unset one.")
+        self.assertEqual(-1, edge.get(KEY_WEIGHT, -1))
+
+        edge["cost"] = 9
+        self.assertNotEqual(Edge(u=1, v=2, capacity=3), edge)
+        del edge["cost"]
+        del edge[KEY_CAPACITY]
+        self.assertEqual(Edge(u=1, v=2), edge)
+        self.assertEqual({KEY_U: 1, KEY_V: 2}, edge)
+        self.assertEqual(2, len(edge))
+        with self.assertRaises(KeyError):
+            del edge[KEY_CAPACITY]
+
+    def test_record_copy_and_pickle(self):
+        edge = Edge(u=1, v=2, flow=0)
+        edge["cost"] = 4
+        for copied in (copy.copy(edge), copy.deepcopy(edge), pickle.loads(pickle.dumps(edge))):
+            self.assertEqual(edge, copied)
+            self.assertEqual(4, len(copied), "Unset keys should still be unset after a copy.")
+            self.assertNotIn(KEY_CAPACITY, copied)
+            self.assertEqual({KEY_U: 1, KEY_V: 2, KEY_FLOW: 0, "cost": 4}, copied)
+        with self.assertRaises(KeyError):
+            edge["keys"] = 1  # a record's own methods can't also be keys.
+
+    def test_get_id_for_edge_uses_identity(self):
+        G = DirectedGraph(V={0: Vertex(label="S"), 1: Vertex(label="T")}, E={})
+        G.add_edge(0, 1, {KEY_CAPACITY: 1})
+        G.add_edge(0, 1, {KEY_CAPACITY: 1})
+        self.assertEqual(1, G.get_id_for_edge(G.E[1]), "An equal edge earlier in E is not the same edge.")
+        self.assertEqual(-1, G.get_id_for_edge(Edge(u=0, v=1, capacity=1)))
+
+    def test_edge_arrays_round_trip(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        columns = G.to_edge_arrays()
+        self.assertEqual(["id", KEY_U, KEY_V, KEY_CAPACITY], list(columns))
+        self.assertEqual([4, 6, 1, 2, 8, 3, 4, 7], columns[KEY_CAPACITY].tolist())
+
+        labels = [G.V[v_id][KEY_LABEL] for v_id in sorted(G.V)]
+        H = DirectedGraph.from_edge_arrays(columns[KEY_U], columns[KEY_V], {KEY_CAPACITY: columns[KEY_CAPACITY]},
+                                           labels=labels, edge_ids=columns["id"])
+        self.assertEqual(G.E, H.E)
+        self.assertEqual(5, H.get_id_for_vertex_with_label("T"))
+        self.assertEqual([H.E[6], H.E[7]], H.get_edges_to_v(5))
+
+    def test_csr_round_trip(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        matrix = G.to_csr()
+        self.assertEqual((6, 6), matrix.shape)
+        self.assertEqual(7, matrix[4, 5])
+        H = DirectedGraph.from_csr(matrix)
+        self.assertEqual(sorted((e[KEY_U], e[KEY_V], e[KEY_CAPACITY]) for e in G.E.values()),
+                         sorted((e[KEY_U], e[KEY_V], e[KEY_CAPACITY]) for e in H.E.values()))
+
+        U = UndirectedGraph(filename="UndirectedGraph2.txt")
+        matrix = U.to_csr(KEY_WEIGHT)
+        self.assertTrue(np.array_equal(matrix.toarray(), matrix.toarray().T), "An undirected graph is symmetric.")
+        self.assertEqual(len(U.E), len(UndirectedGraph.from_csr(matrix, KEY_WEIGHT).E))
+
+    def test_csr_keeps_values(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        labels = [G.V[v_id][KEY_LABEL] for v_id in sorted(G.V)]
+        H = DirectedGraph.from_csr(G.to_csr().astype(float), labels=labels)
+        self.assertTrue(all(type(e[KEY_CAPACITY]) is int for e in H.E.values()),
+                        "A float matrix of whole numbers should give int capacities.")
+
+        G.E[0][KEY_CAPACITY] = 2.5
+        self.assertEqual(2.5, G.to_edge_arrays()[KEY_CAPACITY][0], "Exporting shouldn't truncate floats.")
+        self.assertEqual(2.5, DirectedGraph.from_csr(G.to_csr(), labels=labels).E[0][KEY_CAPACITY])
+
+        U = UndirectedGraph(V=DirectedGraph.make_vertices(3), E={0: Edge(u=1, v=1, weight=3),
+                                                                 1: Edge(u=0, v=2, weight=4)})
+        matrix = U.to_csr(KEY_WEIGHT)
+        self.assertEqual(3, matrix[1, 1], "A self-loop should be on the diagonal once, not twice.")
+        self.assertEqual(4, matrix[2, 0])
+        self.assertEqual(sorted([(1, 1, 3), (0, 2, 4)]),
+                         sorted((e[KEY_U], e[KEY_V], e[KEY_WEIGHT])
+                                for e in UndirectedGraph.from_csr(matrix, KEY_WEIGHT).E.values()))
+
+    def test_solve_graphs_from_arrays(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        labels = [G.V[v_id][KEY_LABEL] for v_id in sorted(G.V)]
+        H = DirectedGraph.from_csr(G.to_csr().astype(float), labels=labels)
+        solver = MaxFlowMinCutSolver()
+        solver.display_graphs = lambda *graphs: None
+        flow, residual = solver.find_max_flow(H, strategy=MaxFlowMinCutSolver.STRATEGY_AUTO)
+        columns = flow.to_edge_arrays((KEY_FLOW,))
+        expected = H.to_edge_arrays()
+        self.assertEqual(expected[KEY_U].tolist(), columns[KEY_U].tolist(), "The flow should come back as arrays.")
+        self.assertEqual(expected[KEY_V].tolist(), columns[KEY_V].tolist())
+        self.assertEqual(np.int64, columns[KEY_FLOW].dtype)
+
+        U = UndirectedGraph(filename="UndirectedGraph2.txt")
+        from_matrix = UndirectedGraph.from_csr(U.to_csr(KEY_WEIGHT).astype(float), KEY_WEIGHT)
+        solver = GlobalMinCutSolver(processes=1)
+        self.assertEqual(solver.find_global_min_cut(U, method=GlobalMinCutSolver.METHOD_STOER_WAGNER)[0],
+                         solver.find_global_min_cut(from_matrix, method=GlobalMinCutSolver.METHOD_STOER_WAGNER)[0])
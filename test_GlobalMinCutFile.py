@@ -0,0 +1,69 @@
+import itertools
+import random
+from unittest import TestCase, mock
+import GlobalMinCutFile
+from GlobalMinCutFile import GlobalMinCutSolver
+from UndirectedGraphFile import UndirectedGraph
+from TypesAndConstants import *
+
+
+class TestGlobalMinCut(TestCase):
+    @staticmethod
+    def weight_crossing(graph, side):
+        return sum(e[KEY_WEIGHT] for e in graph.E.values() if (e[KEY_U] in side) != (e[KEY_V] in side))
+
+    def test_matches_brute_force(self):
+        rng = random.Random(26)
+        for trial in range(20):
+            n = rng.randint(2, 8)
+            V = {i: Vertex(label=str(i), location=(0, 0), color=(1.0, 1.0, 1.0)) for i in range(n)}
+            E = {k: Edge(u=rng.randrange(n), v=rng.randrange(n), weight=rng.randint(0, 9))
+                 for k in range(rng.randint(0, 16))}
+            G = UndirectedGraph(V=V, E=E)
+            best = min(self.weight_crossing(G, set(side))
+                       for r in range(1, n) for side in itertools.combinations(range(n), r))
+
+            for method in (GlobalMinCutSolver.METHOD_STOER_WAGNER, GlobalMinCutSolver.METHOD_KARGER_STEIN):
+                cut_value, side = GlobalMinCutSolver(processes=1, seed=trial).find_global_min_cut(G, method=method)
+                self.assertEqual(best, cut_value, f"Wrong cut value for method {method} on {E}.")
+                self.assertEqual(cut_value, self.weight_crossing(G, set(side)), "Partition doesn't match the value.")
+                self.assertTrue(0 < len(side) < n, "Both sides of the cut should have vertices.")
+
+    def test_small_graph_with_processes(self):
+        # this graph is below BASE_CASE_SIZE, so it is solved by Stoer-Wagner however many processes are asked for.
+        # (test_larger_than_base_case covers the parallel trials.)
+        G = UndirectedGraph(filename="UndirectedGraph2.txt")
+        expected, _ = GlobalMinCutSolver().find_global_min_cut(G, method=GlobalMinCutSolver.METHOD_STOER_WAGNER)
+        cut_value, side = GlobalMinCutSolver(processes=2, trials=4, seed=1).find_global_min_cut(G)
+        self.assertEqual(expected, cut_value)
+        self.assertEqual(cut_value, self.weight_crossing(G, set(side)))
+
+    @staticmethod
+    def random_graph(rng, n, num_edges):
+        V = {i: Vertex(label=str(i), location=(0, 0), color=(1.0, 1.0, 1.0)) for i in range(n)}
+        E = {k: Edge(u=k, v=(k + 1) % n, weight=rng.randint(1, 9)) for k in range(n)}  # a ring, so it's connected.
+        for k in range(n, n + num_edges):
+            E[k] = Edge(u=rng.randrange(n), v=rng.randrange(n), weight=rng.randint(1, 9))
+        return UndirectedGraph(V=V, E=E)
+
+    def test_larger_than_base_case(self):
+        rng = random.Random(29)
+        for trial, n in enumerate((30, 50, 80)):
+            self.assertGreater(n, GlobalMinCutFile.BASE_CASE_SIZE, "These graphs should need contracting.")
+            G = self.random_graph(rng, n, 2 * n)
+            expected, _ = GlobalMinCutSolver().find_global_min_cut(G, method=GlobalMinCutSolver.METHOD_STOER_WAGNER)
+            for processes in (1, 2):
+                cut_value, side = GlobalMinCutSolver(processes=processes, trials=8, seed=trial).find_global_min_cut(G)
+                self.assertEqual(expected, cut_value, f"Wrong cut value with {processes} processes on {n} vertices.")
+                self.assertEqual(cut_value, self.weight_crossing(G, set(side)))
+                self.assertTrue(0 < len(side) < n)
+
+    def test_small_graph_skips_trials(self):
+        G = UndirectedGraph(filename="UndirectedGraph2.txt")
+        self.assertLessEqual(len(G.V), GlobalMinCutFile.BASE_CASE_SIZE)
+        with mock.patch.object(GlobalMinCutFile, "ProcessPoolExecutor") as executor, \
+                mock.patch.object(GlobalMinCutFile, "karger_stein_trial") as trial:
+            cut_value, side = GlobalMinCutSolver(processes=2, trials=4).find_global_min_cut(G)
+        executor.assert_not_called()
+        trial.assert_not_called()
+        self.assertEqual(cut_value, self.weight_crossing(G, set(side)))
@@ -0,0 +1,72 @@
+import random
+from unittest import TestCase
+import numpy as np
+from DirectedGraphFile import DirectedGraph
+from IncrementalRendererFile import IncrementalRenderer
+from TypesAndConstants import *
+
+
+class TestIncrementalRenderer(TestCase):
+    def assert_matches_draw_self(self, renderer, G, message):
+        expected = G.draw_self(caption=KEY_CAPACITY, color=(0.75, 1.0, 0.25))
+        drawn = renderer.draw_panel(KEY_CAPACITY, G, caption=KEY_CAPACITY, color=(0.75, 1.0, 0.25), size=(800, 800))
+        self.assertTrue(np.array_equal(expected, drawn), message)
+
+    def test_redraws_only_changes(self):
+        G = DirectedGraph(filename="DirectedGraph3.txt")
+        renderer = IncrementalRenderer()
+        self.assert_matches_draw_self(renderer, G, "The first frame should match draw_self.")
+        self.assertEqual(1, renderer.full_redraws)
+        self.assertEqual(len(G.E), renderer.edges_redrawn)
+
+        renderer.edges_redrawn = 0
+        self.assert_matches_draw_self(renderer, G, "An unchanged frame should match draw_self.")
+        self.assertEqual(0, renderer.edges_redrawn, "Nothing changed, so nothing should be redrawn.")
+
+        for e_id in list(G.E)[:2]:
+            G.E[e_id][KEY_CAPACITY] += 1
+        G.add_edge(0, 12, {KEY_CAPACITY: 7})
+        del G.E[list(G.E)[-5]]
+        self.assert_matches_draw_self(renderer, G, "A changed frame should match draw_self.")
+        self.assertEqual(1, renderer.full_redraws)
+        self.assertLess(renderer.edges_redrawn, len(G.E))
+
+    def test_vertex_change_redraws_panel(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        renderer = IncrementalRenderer()
+        self.assert_matches_draw_self(renderer, G, "The first frame should match draw_self.")
+        G.V[0][KEY_COLOR] = (0.25, 0.75, 1.0)
+        self.assert_matches_draw_self(renderer, G, "Recoloring a vertex should be drawn, with cut edges recolored.")
+        self.assertEqual(2, renderer.full_redraws)
+
+    @staticmethod
+    def grid_graph(n, spacing):
+        V = {r * n + c: Vertex(label=str(r * n + c), location=(10 + spacing * c, 10 + spacing * r),
+                               color=(1.0, 1.0, 1.0))
+             for r in range(n) for c in range(n)}
+        G = DirectedGraph(V=V, E={}, keys=(KEY_CAPACITY,))
+        for r in range(n):
+            for c in range(n):
+                if c + 1 < n:
+                    G.add_edge(r * n + c, r * n + c + 1, {KEY_CAPACITY: 5})
+                if r + 1 < n:
+                    G.add_edge(r * n + c, (r + 1) * n + c, {KEY_CAPACITY: 5})
+        return G
+
+    def test_dense_changes_redraw_each_edge_once(self):
+        G = self.grid_graph(12, 26)  # close enough that neighboring labels overlap.
+        rng = random.Random(32)
+        renderer = IncrementalRenderer()
+        self.assert_matches_draw_self(renderer, G, "The first frame should match draw_self.")
+        for frame in range(4):
+            renderer.edges_redrawn = 0
+            for e_id in rng.sample(sorted(G.E), len(G.E) // 5):
+                G.E[e_id][KEY_CAPACITY] += rng.randint(1, 200)
+            self.assert_matches_draw_self(renderer, G, f"Frame {frame} should match draw_self.")
+            self.assertLessEqual(renderer.edges_redrawn, len(G.E), "No edge should be drawn twice in one frame.")
+        self.assertEqual(1, renderer.full_redraws)
+
+        for e_id in rng.sample(sorted(G.E), len(G.E) // 2):
+            del G.E[e_id]
+        self.assert_matches_draw_self(renderer, G, "Removing half the edges should match draw_self.")
+        self.assertEqual(2, renderer.full_redraws, "So many changes should just redraw the whole panel.")
@@ -0,0 +1,69 @@
+import subprocess
+import sys
+from unittest import TestCase
+from DirectedGraphFile import DirectedGraph
+from MaxFlowMinCutSolverFile import MaxFlowMinCutSolver
+from TypesAndConstants import *
+
+
+class TestMaxFlowMinCutSolver(TestCase):
+    def test_find_shortest_path_in_graph(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        self.assertEqual([0, 1, 3, 5], MaxFlowMinCutSolver.find_shortest_path_in_graph(G))
+        self.assertEqual([0, 2, 4, 5], MaxFlowMinCutSolver.find_shortest_path_in_graph(G, minimum=3),
+                         "Edges with less than the minimum capacity should not be used.")
+        self.assertIsNone(MaxFlowMinCutSolver.find_shortest_path_in_graph(G, minimum=9))
+
+    def test_find_widest_path_in_graph(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        self.assertEqual([0, 2, 4, 5], MaxFlowMinCutSolver.find_widest_path_in_graph(G))
+        for edge in G.get_edges_from_u(0):
+            edge[KEY_CAPACITY] = 0
+        self.assertIsNone(MaxFlowMinCutSolver.find_widest_path_in_graph(G))
+
+    def test_choose_strategy(self):
+        solver = MaxFlowMinCutSolver()
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        self.assertEqual(MaxFlowMinCutSolver.STRATEGY_SHORTEST, solver.choose_strategy(G),
+                         "With 6 vertices and capacities up to 8, V*E/2 is below 2E*log2(U).")
+
+        V = {i: Vertex(label=str(i), location=(0, 0), color=(1.0, 1.0, 1.0)) for i in range(100)}
+        E = {i: Edge(u=i, v=i + 1, capacity=1000 + 10 * i) for i in range(99)}
+        G = DirectedGraph(V=V, E=E)
+        self.assertEqual(MaxFlowMinCutSolver.STRATEGY_SCALING, solver.choose_strategy(G),
+                         "With 100 vertices and capacities around 2000, scaling's bound is smaller.")
+        for e in G.E.values():
+            e[KEY_CAPACITY] *= 10 ** 9
+        self.assertEqual(MaxFlowMinCutSolver.STRATEGY_SHORTEST, solver.choose_strategy(G))
+
+    def test_find_max_flow_strategies(self):
+        searches = []
+
+        class RecordingSolver(MaxFlowMinCutSolver):
+            def find_augmenting_path(self, residual, strategy, delta=1):
+                searches.append((strategy, delta))
+                return super().find_augmenting_path(residual, strategy, delta)
+
+            def display_graphs(self, *graphs):
+                pass
+
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        G.E[4][KEY_CAPACITY] = 8.0  # the largest capacity; a float shouldn't break the bit arithmetic.
+        solver = RecordingSolver()
+        solver.find_max_flow(G, strategy=MaxFlowMinCutSolver.STRATEGY_SCALING)
+        self.assertEqual([8, 4, 2, 1], [delta for _, delta in searches[-4:]],
+                         "Once no path is this wide, delta should halve down to 1.")
+
+        searches.clear()
+        solver.find_max_flow(G, strategy=MaxFlowMinCutSolver.STRATEGY_AUTO)
+        self.assertEqual({MaxFlowMinCutSolver.STRATEGY_SHORTEST}, {strategy for strategy, _ in searches})
+
+    def test_solving_does_not_import_cv2(self):
+        output = subprocess.run([sys.executable, "-c",
+                                 "import sys, MaxFlowMinCutSolverFile, MSTFile\n"
+                                 "from DirectedGraphFile import DirectedGraph\n"
+                                 "G = DirectedGraph(filename='DirectedGraph1.txt')\n"
+                                 "MaxFlowMinCutSolverFile.MaxFlowMinCutSolver.find_shortest_path_in_graph(G)\n"
+                                 "print('cv2' in sys.modules)"],
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual("False", output.strip(), "Building and searching a graph should not load OpenCV.")
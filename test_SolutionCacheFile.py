@@ -0,0 +1,103 @@
+import tempfile
+from unittest import TestCase
+from DirectedGraphFile import DirectedGraph
+from UndirectedGraphFile import UndirectedGraph
+from MSTFile import MST
+from MaxFlowMinCutSolverFile import MaxFlowMinCutSolver
+from SolutionCacheFile import SolutionCache
+from TypesAndConstants import *
+
+
+class TestSolutionCache(TestCase):
+    def test_hash_graph(self):
+        G1 = DirectedGraph(filename="DirectedGraph1.txt")
+        G2 = DirectedGraph(filename="DirectedGraph1.txt")
+        self.assertEqual(SolutionCache.hash_graph(G1), SolutionCache.hash_graph(G2),
+                         "Two graphs loaded from the same file should hash the same.")
+
+        reordered = DirectedGraph(V=dict(reversed(list(G1.V.items()))), E=dict(reversed(list(G1.E.items()))))
+        self.assertEqual(SolutionCache.hash_graph(G1), SolutionCache.hash_graph(reordered),
+                         "The hash should not depend on the order of the dictionaries.")
+
+        G2.E[3][KEY_CAPACITY] += 1
+        self.assertNotEqual(SolutionCache.hash_graph(G1), SolutionCache.hash_graph(G2),
+                            "Changing a capacity should change the hash.")
+
+        G3 = DirectedGraph(filename="DirectedGraph1.txt")
+        G3.E[3]["bandwidth"] = 5
+        self.assertNotEqual(SolutionCache.hash_graph(G1, keys=("bandwidth",)),
+                            SolutionCache.hash_graph(G3, keys=("bandwidth",)),
+                            "Changing any of the keys that are hashed should change the hash.")
+        self.assertEqual(SolutionCache.hash_graph(G1), SolutionCache.hash_graph(G3),
+                         "Keys that aren't hashed shouldn't matter.")
+
+        G4 = DirectedGraph(filename="DirectedGraph1.txt")
+        G4.E[3][KEY_WEIGHT] = -1
+        self.assertNotEqual(SolutionCache.hash_graph(G1), SolutionCache.hash_graph(G4),
+                            "A weight of -1 should not hash the same as no weight.")
+
+        undirected = UndirectedGraph(V=G1.V, E=G1.E)
+        self.assertNotEqual(SolutionCache.hash_graph(G1), SolutionCache.hash_graph(undirected),
+                            "A directed graph and an undirected graph should not share a hash.")
+
+    def test_lru_eviction(self):
+        cache = SolutionCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(1, cache.get("a"))
+        cache.put("c", 3)  # "b" is now the least recently used.
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(1, cache.get("a"))
+        self.assertEqual(3, cache.get("c"))
+        self.assertEqual(2, len(cache))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            SolutionCache(directory=directory).put("key", {1: [2, 3]})
+            self.assertEqual({1: [2, 3]}, SolutionCache(directory=directory).get("key"),
+                             "A second cache on the same directory should find the first one's result.")
+
+    def test_mst_uses_cache(self):
+        G = UndirectedGraph(filename="UndirectedGraph2.txt")
+        cache = SolutionCache()
+        stored_E = {1: Edge(u=0, v=2, weight=4)}
+        cache.put(cache.make_key(G, "MST", MST.METHOD_KRUSKAL), (stored_E, [KEY_WEIGHT]))
+
+        generator = MST(G, cache=cache)
+        generator.solve(method=MST.METHOD_KRUSKAL)
+        self.assertEqual(stored_E, generator.MST_result.E)
+        self.assertEqual([KEY_WEIGHT], generator.MST_result.additional_keys)
+        self.assertIs(G.V, generator.MST_result.V)
+        self.assertEqual(1, cache.hits)
+
+    def test_max_flow_key_covers_capacity_key(self):
+        G1 = DirectedGraph(filename="DirectedGraph1.txt")
+        G2 = DirectedGraph(filename="DirectedGraph1.txt")
+        for G, amount in ((G1, 1), (G2, 2)):
+            for e in G.E.values():
+                e["bandwidth"] = amount
+        cache = SolutionCache()
+        solver = MaxFlowMinCutSolver(cache=cache)
+        solver.display_graphs = lambda *graphs: None
+        solver.find_max_flow(G1, capacity_key="bandwidth")
+        solver.find_max_flow(G2, capacity_key="bandwidth")
+        self.assertEqual(0, cache.hits, "Graphs that differ only in the capacity_key's values must not share a result.")
+        self.assertEqual(2, len(cache))
+
+    def test_max_flow_twice(self):
+        cache = SolutionCache()
+        solver = MaxFlowMinCutSolver(cache=cache)
+        solver.display_graphs = lambda *graphs: None
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        first_flow, first_residual = solver.find_max_flow(G)
+        second_flow, second_residual = solver.find_max_flow(G)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(first_flow.E, second_flow.E)
+        self.assertEqual([KEY_FLOW], second_flow.additional_keys)
+        self.assertEqual(first_residual.additional_keys, second_residual.additional_keys)
+        first_columns, second_columns = first_flow.to_edge_arrays(), second_flow.to_edge_arrays()
+        self.assertEqual(list(first_columns), list(second_columns), "A cached flow should export the same columns.")
+        for key in first_columns:
+            self.assertTrue((first_columns[key] == second_columns[key]).all())
+        self.assertTrue(all(isinstance(e, Edge) and KEY_CAPACITY not in e for e in second_flow.E.values()),
+                        "Cached records should come back with the same keys set.")
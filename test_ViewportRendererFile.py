@@ -0,0 +1,42 @@
+import os
+import tempfile
+from unittest import TestCase
+import numpy as np
+from DirectedGraphFile import DirectedGraph
+from ViewportRendererFile import Viewport, ViewportRenderer
+
+
+class TestViewportRenderer(TestCase):
+    def test_render_matches_draw_self(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        expected = G.draw_self(color=(0.75, 1.0, 0.25))
+        drawn = ViewportRenderer(G).render(Viewport(0, 0, 800, 800), color=(0.75, 1.0, 0.25))
+        self.assertTrue(np.allclose(expected, drawn), "An 800x800 viewport at (0,0) should look just like draw_self.")
+
+    def test_culling(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        renderer = ViewportRenderer(G, cell_size=20)
+        bounds = Viewport(161, 0, 89, 200).graph_bounds()  # just the column x = 161 -> 250, around T.
+        self.assertEqual({5}, renderer.grid.vertices_in(bounds))
+        self.assertEqual({6, 7}, renderer.grid.edges_in(bounds))
+
+    def test_viewport_zoom_about(self):
+        viewport = Viewport(10, 20, 100, 100, zoom=1.0)
+        viewport.zoom_about(2.0, pixel=(50, 50))
+        self.assertEqual((35.0, 45.0, 85.0, 95.0), viewport.graph_bounds())
+
+    def test_render_tiles(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        with tempfile.TemporaryDirectory() as directory:
+            paths = ViewportRenderer(G).render_tiles(300, 200, directory, tile_size=128, processes=1)
+            self.assertEqual(6, len(paths))
+            self.assertTrue(all(os.path.exists(path) for path in paths))
+
+    def test_tiles_agree_at_seams(self):
+        G = DirectedGraph(filename="DirectedGraph1.txt")
+        renderer = ViewportRenderer(G)
+        whole = renderer.render(Viewport(0, 0, 256, 256))
+        left = renderer.render(Viewport(0, 0, 128, 256))
+        right = renderer.render(Viewport(128, 0, 128, 256))
+        self.assertTrue(np.array_equal(whole, np.hstack([left, right])),
+                        "With random colors, an edge should keep its color from one tile to the next.")